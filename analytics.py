@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Aufgaben-Analyse — Schwierigkeit pro Zahl, inkrementell aus den Antworten
+#
+# Pro Aufgabe (Schlüssel: roman) werden laufend gepflegt:
+# - Versuche / richtig
+# - häufigste falsche (normalisierte) Antworten: Space-Saving-Sketch mit fester Größe;
+#   angezeigt wird die untere Schranke (Zähler minus geerbter Fehler)
+# - Antwortzeiten: logarithmisches Histogramm, nur belegte Buckets (Quantile mit ~5 % Fehler)
+# Falsche Antworten werden auf MAX_ANSWER_LEN Zeichen gekürzt. Der Speicher pro Aufgabe
+# ist damit beschränkt, egal wie viele Antworten verarbeitet werden; Aufgaben ohne
+# Antwortzeiten oder Fehler belegen fast nichts. Insgesamt wächst er mit der Zahl der
+# beantworteten Aufgaben.
+
+import csv
+import io
+import math
+import threading
+
+TOP_WRONG = 32          # Zähler im Heavy-Hitter-Sketch pro Aufgabe (deutlich mehr als angezeigt)
+SHOW_WRONG = 3          # angezeigte häufige Fehler pro Aufgabe
+MAX_ANSWER_LEN = 64     # längere falsche Antworten werden gekürzt gezählt
+TIME_MIN = 0.1          # Sekunden; kürzere Zeiten landen im ersten Bucket
+TIME_MAX = 600.0        # Sekunden; längere Zeiten landen im letzten Bucket
+GAMMA = 1.1             # relative Bucket-Breite
+N_BUCKETS = int(math.ceil(math.log(TIME_MAX / TIME_MIN, GAMMA))) + 1
+
+
+# -------------------- Sketches --------------------
+class SpaceSaving:
+    # Heavy Hitters mit höchstens `k` Zählern (Metwally et al.).
+    # Ein verdrängter Wert vererbt den kleinsten Zähler als Fehlerschranke.
+    def __init__(self, k=TOP_WRONG):
+        self.k = k
+        self.counts = {}   # wert -> [anzahl, fehler]
+
+    def add(self, value):
+        c = self.counts.get(value)
+        if c is not None:
+            c[0] += 1
+        elif len(self.counts) < self.k:
+            self.counts[value] = [1, 0]
+        else:
+            victim = min(self.counts, key=lambda v: self.counts[v][0])
+            n = self.counts.pop(victim)[0]
+            self.counts[value] = [n + 1, n]
+
+    def top(self, n=None):
+        items = sorted(self.counts.items(), key=lambda kv: -kv[1][0])
+        return [(v, c, err) for v, (c, err) in items[:n]]
+
+    def guaranteed(self, n=None):
+        # (wert, untere Schranke c - fehler), nur Werte, die sicher vorkamen
+        items = sorted(((v, c - err) for v, (c, err) in self.counts.items()), key=lambda kv: -kv[1])
+        return [(v, low) for v, low in items if low > 0][:n]
+
+
+class TimeDigest:
+    # Log-Histogramm über [TIME_MIN, TIME_MAX]; höchstens N_BUCKETS Einträge.
+    def __init__(self):
+        self.buckets = {}   # bucket-index -> anzahl
+        self.n = 0
+
+    def add(self, seconds):
+        if seconds <= TIME_MIN:
+            i = 0
+        else:
+            i = min(N_BUCKETS - 1, int(math.log(seconds / TIME_MIN, GAMMA)) + 1)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        self.n += 1
+
+    def quantile(self, q):
+        if self.n == 0:
+            return None
+        rank = q * (self.n - 1)
+        seen = 0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen > rank:
+                if i == 0:
+                    return TIME_MIN
+                # geometrische Mitte des Buckets
+                return TIME_MIN * GAMMA ** (i - 0.5)
+        return TIME_MAX
+
+
+# -------------------- Aufgaben-Statistik --------------------
+class ItemStats:
+    def __init__(self, label=""):
+        self.label = label
+        self.attempts = 0
+        self.correct = 0
+        self.wrong = SpaceSaving()
+        self.times = TimeDigest()
+
+    def add(self, correct, answer_norm, seconds):
+        self.attempts += 1
+        if correct:
+            self.correct += 1
+        elif answer_norm:
+            self.wrong.add(answer_norm[:MAX_ANSWER_LEN])
+        if seconds is not None:
+            self.times.add(seconds)
+
+    @property
+    def accuracy(self):
+        return self.correct / self.attempts if self.attempts else 0.0
+
+
+_items = {}
+_lock = threading.Lock()
+
+
+def record(item, label, correct, answer_norm="", seconds=None):
+    with _lock:
+        s = _items.get(item)
+        if s is None:
+            s = _items[item] = ItemStats(label)
+        s.add(correct, answer_norm, seconds)
+
+
+def reset():
+    with _lock:
+        _items.clear()
+
+
+def rows():
+    # Eine Zeile pro Aufgabe, schwierigste zuerst.
+    out = []
+    with _lock:
+        for item, s in _items.items():
+            p50, p90 = s.times.quantile(0.5), s.times.quantile(0.9)
+            out.append({
+                "Aufgabe": item,
+                "Griechisch": s.label,
+                "Versuche": s.attempts,
+                "Richtig": s.correct,
+                "Quote": round(s.accuracy, 3),
+                "Häufige Fehler": "; ".join(f"{v} ({c})" for v, c in s.wrong.guaranteed(SHOW_WRONG)),
+                "Zeit p50 (s)": round(p50, 1) if p50 is not None else None,
+                "Zeit p90 (s)": round(p90, 1) if p90 is not None else None,
+            })
+    out.sort(key=lambda r: (r["Quote"], -r["Versuche"]))
+    return out
+
+
+def to_csv() -> bytes:
+    data = rows()
+    buf = io.StringIO()
+    fields = list(data[0]) if data else ["Aufgabe", "Griechisch", "Versuche", "Richtig", "Quote",
+                                          "Häufige Fehler", "Zeit p50 (s)", "Zeit p90 (s)"]
+    w = csv.DictWriter(buf, fieldnames=fields)
+    w.writeheader()
+    w.writerows(data)
+    return buf.getvalue().encode("utf-8")
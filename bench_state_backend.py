@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Benchmark: Durchsatz mit 1..N App-Prozessen und gemeinsamem SQLite-Zustand
+#
+# Jeder Prozess spielt Schüler-Durchläufe nach, wie sie ein Streamlit-Rerun erzeugt:
+# Zustand per snapshot.restore() laden, Frage ziehen, Antwort bewerten,
+# simulierte Skriptlaufzeit (--work-ms CPU), Zustand per snapshot.save() sichern.
+# Alle Prozesse teilen dieselbe SQLite-Datei (state_backend.SQLiteBackend).
+#
+# Die Schüler-Tokens liegen in einer gemeinsamen Warteschlange: jeder Durchlauf nimmt
+# sich ein Token, und der nächste Durchlauf desselben Schülers landet meist auf einem
+# anderen Prozess. Mit dem Token wandert der zuletzt gesicherte Punktestand mit; lädt
+# ein Prozess einen älteren Stand (z. B. weil der Hintergrund-Schreiber des vorigen
+# Prozesses noch nicht fertig war), zählt das als Inkonsistenz. Vor der Übergabe wird
+# deshalb snapshot.flush() aufgerufen; --no-flush zeigt, was ohne passiert.
+#
+# Start:
+#   python bench_state_backend.py                 # 1, 2, 4 Prozesse, je 5 s
+#   python bench_state_backend.py -p 1 2 4 8 -d 10 --work-ms 5
+#   python bench_state_backend.py --no-flush      # veraltete Stände sichtbar machen
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import secrets
+import tempfile
+import time
+
+import snapshot
+import state_backend
+from greek_numbers_core import ENTRIES, strip_accents, is_correct
+
+
+def _turn(token, expected, rng, work_s):
+    # Gibt den neuen Punktestand zurück und ob der geladene Stand aktuell war.
+    state = {}
+    if not snapshot.restore(token, state, "ENTRIES", ENTRIES):
+        state.update(started=True, mode="WRITE", rounds=10, round_i=0, score=0,
+                     answer="", feedback="", await_next=False)
+    consistent = state["score"] == expected
+    state["current_i"] = rng.randrange(len(ENTRIES))
+    state["current"] = ENTRIES[state["current_i"]]
+    answer = rng.choice(ENTRIES)["greek"].split("/")[0]
+    if is_correct(answer, state["current"]["greek"]):
+        state["score"] += 1
+    state["round_i"] = state.get("round_i", 0) % state["rounds"] + 1
+    state["answer"] = answer
+    # simulierte Laufzeit des restlichen Skripts (Widgets, Layout, ...)
+    end = time.perf_counter() + work_s
+    while time.perf_counter() < end:
+        strip_accents(answer)
+    snapshot.save(token, state, "ENTRIES", ENTRIES)
+    return state["score"], consistent
+
+
+def _worker(db, wid, tokens, duration, work_ms, handoff_flush, start, results):
+    snapshot.set_backend(state_backend.SQLiteBackend(db))
+    rng = random.Random(wid)
+    start.wait()
+    turns = 0
+    stale = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        token, expected = tokens.get()
+        score, consistent = _turn(token, expected, rng, work_ms / 1000.0)
+        stale += not consistent
+        if handoff_flush:
+            snapshot.flush()
+        tokens.put((token, score))
+        turns += 1
+    snapshot.flush()
+    results.put((turns, stale))
+
+
+def run(processes, duration, learners, work_ms, db, handoff_flush=True):
+    # Gibt (Reruns/s, Anzahl inkonsistenter Ladevorgänge) zurück.
+    start = mp.Barrier(processes)
+    results = mp.Queue()
+    tokens = mp.Queue()
+    run_id = secrets.token_hex(4)
+    for i in range(learners):
+        tokens.put((f"bench{run_id}x{i:05d}", 0))
+    procs = [mp.Process(target=_worker, args=(db, w, tokens, duration, work_ms, handoff_flush, start, results))
+             for w in range(processes)]
+    for p in procs:
+        p.start()
+    total = stale = 0
+    for _ in procs:
+        t, s = results.get()
+        total += t
+        stale += s
+    for _ in range(learners):
+        tokens.get()
+    for p in procs:
+        p.join()
+    return total / duration, stale
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Durchsatz des Quiz-Zustands über mehrere Prozesse")
+    ap.add_argument("-p", "--processes", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("-d", "--duration", type=float, default=5.0, help="Sekunden pro Messung")
+    ap.add_argument("-l", "--learners", type=int, default=50, help="Schüler insgesamt (von allen Prozessen geteilt)")
+    ap.add_argument("--work-ms", type=float, default=2.0, help="simulierte CPU-Zeit pro Rerun")
+    ap.add_argument("--db", help="SQLite-Datei (Standard: temporär)")
+    ap.add_argument("--no-flush", action="store_true", help="Zustand ohne snapshot.flush() an den nächsten Prozess übergeben")
+    args = ap.parse_args(argv)
+
+    tmpdir = None
+    db = args.db
+    if db is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        db = os.path.join(tmpdir.name, "bench.sqlite3")
+    state_backend.SQLiteBackend(db)   # Tabelle anlegen, bevor die Worker starten
+
+    print(f"CPUs: {os.cpu_count()}   work: {args.work_ms} ms/rerun   db: {db}")
+    print(f"{'Prozesse':>9} {'Reruns/s':>10} {'Faktor':>7} {'veraltet':>9}")
+    base = None
+    for n in args.processes:
+        rate, stale = run(n, args.duration, args.learners, args.work_ms, db, not args.no_flush)
+        base = base or rate
+        print(f"{n:>9} {rate:>10.0f} {rate / base:>7.2f} {stale:>9}")
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# Klassenzimmer-Register — prozessweite Live-Rangliste über alle Sessions
+#
+# Sessions treten einem Raum per Raumcode bei und melden jede Antwort.
+# Alle Aggregate werden inkrementell gepflegt (kein Durchlaufen aller Sessions):
+# - Punkte-Buckets: score -> nach (Name, sid) sortierte Liste der Schüler,
+#   dazu sortierte Liste der verschiedenen Punktestände
+# - laufende Trefferquote pro Aufgabe (Versuche / richtig)
+# - Zähler pro Raum
+# Update: Binärsuche O(log k + log b) mit k = Anzahl verschiedener Punktestände
+# (k <= Fragenanzahl + 1) und b = Schüler im Bucket; das Einfügen in die Listen
+# verschiebt höchstens k bzw. b Referenzen.
+# Rangliste lesen: O(N) für die Top-N (Buckets sind schon sortiert), zwischen Updates gecacht.
+# Schüler ohne Aktivität seit IDLE_SECONDS werden entfernt, leere Räume danach
+# verworfen (höchstens alle PRUNE_INTERVAL Sekunden, beim nächsten get_room()).
+# Kommt ein Schüler zurück, wird sein Eintrag aus dem Punktestand der Session neu angelegt.
+# Von der Lehrkraft geschlossene Räume (close_room) entstehen bis zum Neustart nicht neu.
+# Verwaltung (Entfernen, Schließen, Statistik zurücksetzen) nur mit GREEK_TEACHER_KEY.
+
+import bisect
+import hmac
+import os
+import threading
+import time
+
+TOP_N = 10
+TEACHER_KEY = os.environ.get("GREEK_TEACHER_KEY", "")
+IDLE_SECONDS = float(os.environ.get("GREEK_ROOM_IDLE_SECONDS", "1800"))
+PRUNE_INTERVAL = 60.0
+
+
+class Room:
+    def __init__(self, code):
+        self.code = code
+        self.lock = threading.Lock()
+        self.students = {}   # sid -> {"name", "score", "answered", "correct", "round_i", "rounds", "last_seen"}
+        self.buckets = {}    # score -> [(name, sid), ...] sortiert
+        self.scores = []     # verschiedene Punktestände, aufsteigend
+        self.items = {}      # item -> [versuche, richtig]
+        self.answered = 0
+        self.correct = 0
+        self.version = 0
+        self.last_seen = time.monotonic()
+        self._cache = (None, None, [])
+
+    # ---- interne Bucket-Pflege (Lock muss gehalten werden) ----
+    def _bucket_add(self, sid, score):
+        b = self.buckets.get(score)
+        if b is None:
+            b = self.buckets[score] = []
+            bisect.insort(self.scores, score)
+        bisect.insort(b, (self.students[sid]["name"], sid))
+
+    def _bucket_remove(self, sid, score):
+        b = self.buckets.get(score)
+        if b is None:
+            return
+        entry = (self.students[sid]["name"], sid)
+        i = bisect.bisect_left(b, entry)
+        if i < len(b) and b[i] == entry:
+            del b[i]
+        if not b:
+            del self.buckets[score]
+            i = bisect.bisect_left(self.scores, score)
+            if i < len(self.scores) and self.scores[i] == score:
+                del self.scores[i]
+
+    # ---- Ereignisse ----
+    def join(self, sid, name, score=0, round_i=0, rounds=0):
+        # Bei jedem Durchlauf aufrufen; hält den Schüler auch als aktiv markiert.
+        # score/round_i/rounds aus der Session gelten nur für einen neuen Eintrag.
+        now = time.monotonic()
+        with self.lock:
+            self.last_seen = now
+            s = self.students.get(sid)
+            if s is None:
+                self.students[sid] = {"name": name, "score": score, "answered": 0, "correct": score,
+                                      "round_i": round_i, "rounds": rounds, "last_seen": now}
+                self._bucket_add(sid, score)
+            elif s["name"] != name:
+                self._bucket_remove(sid, s["score"])
+                s["name"] = name
+                s["last_seen"] = now
+                self._bucket_add(sid, s["score"])
+            else:
+                s["last_seen"] = now
+                return
+            self.version += 1
+
+    def leave(self, sid):
+        with self.lock:
+            s = self.students.get(sid)
+            if s is not None:
+                self._bucket_remove(sid, s["score"])
+                del self.students[sid]
+                self.version += 1
+
+    def prune(self, idle_seconds=IDLE_SECONDS):
+        # Entfernt Schüler, die seit idle_seconds nichts mehr getan haben. Gibt die Anzahl zurück.
+        cutoff = time.monotonic() - idle_seconds
+        with self.lock:
+            idle = [sid for sid, s in self.students.items() if s["last_seen"] < cutoff]
+            for sid in idle:
+                self._bucket_remove(sid, self.students[sid]["score"])
+                del self.students[sid]
+            if idle:
+                self.version += 1
+            return len(idle)
+
+    def start(self, sid, rounds):
+        with self.lock:
+            s = self.students.get(sid)
+            if s is None:
+                return
+            self._bucket_remove(sid, s["score"])
+            s.update(score=0, answered=0, correct=0, round_i=0, rounds=rounds)
+            self._bucket_add(sid, 0)
+            self.version += 1
+
+    def record(self, sid, item, correct, round_i=None):
+        with self.lock:
+            stats = self.items.get(item)
+            if stats is None:
+                stats = self.items[item] = [0, 0]
+            stats[0] += 1
+            self.answered += 1
+            if correct:
+                stats[1] += 1
+                self.correct += 1
+            s = self.students.get(sid)
+            if s is not None:
+                s["last_seen"] = time.monotonic()
+                s["answered"] += 1
+                if round_i is not None:
+                    s["round_i"] = round_i
+                if correct:
+                    self._bucket_remove(sid, s["score"])
+                    s["score"] += 1
+                    s["correct"] += 1
+                    self._bucket_add(sid, s["score"])
+            self.version += 1
+
+    # ---- Lesen ----
+    def leaderboard(self, n=TOP_N):
+        with self.lock:
+            version, cached_n, rows = self._cache
+            if version == self.version and cached_n == n:
+                return rows
+            rows = []
+            for score in reversed(self.scores):
+                for _, sid in self.buckets[score]:
+                    s = self.students[sid]
+                    rows.append({"Name": s["name"], "Punkte": s["score"],
+                                 "Beantwortet": s["answered"],
+                                 "Runde": f"{s['round_i']}/{s['rounds']}"})
+                    if len(rows) >= n:
+                        break
+                if len(rows) >= n:
+                    break
+            self._cache = (self.version, n, rows)
+            return rows
+
+    def item_stats(self):
+        with self.lock:
+            return {item: (a, c, c / a if a else 0.0) for item, (a, c) in self.items.items()}
+
+    def totals(self):
+        with self.lock:
+            return {"students": len(self.students), "answered": self.answered, "correct": self.correct,
+                    "accuracy": self.correct / self.answered if self.answered else 0.0}
+
+
+# -------------------- Register --------------------
+_rooms = {}
+_closed = set()      # von der Lehrkraft geschlossene Raumcodes
+_rooms_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def teacher_ok(key: str) -> bool:
+    return bool(TEACHER_KEY) and hmac.compare_digest((key or "").encode("utf-8"), TEACHER_KEY.encode("utf-8"))
+
+
+def normalize_code(code: str) -> str:
+    return (code or "").strip().upper()
+
+
+def get_room(code: str, create: bool = True):
+    code = normalize_code(code)
+    if not code:
+        return None
+    _maybe_prune()
+    room = _rooms.get(code)
+    if room is None and create:
+        with _rooms_lock:
+            room = _rooms.get(code)
+            if room is None and code not in _closed:
+                room = _rooms[code] = Room(code)
+    return room
+
+
+def room_codes():
+    with _rooms_lock:
+        return sorted(_rooms)
+
+
+def drop_room(code: str):
+    with _rooms_lock:
+        _rooms.pop(normalize_code(code), None)
+
+
+def close_room(code: str):
+    # Schließt den Raum; get_room() legt ihn danach nicht wieder an.
+    code = normalize_code(code)
+    with _rooms_lock:
+        _rooms.pop(code, None)
+        _closed.add(code)
+
+
+def is_closed(code: str) -> bool:
+    return normalize_code(code) in _closed
+
+
+def _maybe_prune():
+    # Inaktive Schüler entfernen und leere, inaktive Räume schließen.
+    global _last_prune
+    now = time.monotonic()
+    if now - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = now
+    with _rooms_lock:
+        rooms = list(_rooms.values())
+    for room in rooms:
+        room.prune()
+        if not room.students and now - room.last_seen > IDLE_SECONDS:
+            with _rooms_lock:
+                if _rooms.get(room.code) is room and not room.students:
+                    del _rooms[room.code]
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Binäres Deck-Format (.gndk) — sehr große Pools ohne Ladezeit per mmap öffnen
+#
+# Aufbau (little endian):
+#   Header   : magic "GNDK", version u16, reserviert u16, anzahl u32,
+#              offset Stringtabelle u64, länge Stringtabelle u64
+#   Einträge : anzahl × (arabic i64, 4 × (offset u32, länge u32))
+#              Felder: roman, latin, greek, greek_key (vor-normalisiert, "/"-getrennt)
+#   Strings  : UTF-8, gleiche Strings nur einmal gespeichert
+# Einträge sind nach (arabic, roman) sortiert und eindeutig; find() sucht binär.
+# Dicts werden erst beim Zugriff (Frage anzeigen) dekodiert; zum Bewerten reicht
+# greek_key(i), ohne den Eintrag zu dekodieren. Leere Decks werden abgelehnt. Da die Datei nur lesend
+# gemappt wird, teilen sich alle Worker-Prozesse dieselben Seiten im Page Cache.
+#
+# Konvertieren:
+#   python deck_bin.py zahlen.csv mehr.json -o zahlen.gndk
+
+import argparse
+import mmap
+import os
+import struct
+
+from greek_numbers_core import greek_key, load_csv_bytes, load_json_bytes
+
+MAGIC = b"GNDK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQQ")
+RECORD = struct.Struct("<qIIIIIIII")
+
+
+# -------------------- Schreiben --------------------
+def write_deck(entries, path):
+    uniq = {}
+    for e in entries:
+        uniq.setdefault((e["arabic"], e["roman"]), e)
+    rows = [uniq[k] for k in sorted(uniq)]
+    if not rows:
+        raise ValueError("Keine gültigen Einträge – leeres Deck wird nicht geschrieben")
+
+    strings = bytearray()
+    table = {}
+    def intern(s):
+        ref = table.get(s)
+        if ref is None:
+            b = s.encode("utf-8")
+            ref = table[s] = (len(strings), len(b))
+            strings.extend(b)
+        return ref
+
+    records = bytearray()
+    for e in rows:
+        refs = []
+        for s in (e["roman"], e["latin"], e["greek"], greek_key(e["greek"])):
+            refs.extend(intern(s))
+        records.extend(RECORD.pack(e["arabic"], *refs))
+
+    strings_offset = HEADER.size + len(records)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(rows), strings_offset, len(strings)))
+        f.write(records)
+        f.write(strings)
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def convert(paths, out_path):
+    entries = []
+    for p in paths:
+        with open(p, "rb") as f:
+            b = f.read()
+        entries.extend(load_csv_bytes(b) if p.lower().endswith(".csv") else load_json_bytes(b))
+    return write_deck(entries, out_path)
+
+
+# -------------------- Lesen --------------------
+class BinaryDeck:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"{path}: kein gültiges Deck")
+        magic, version, _, n, strings_offset, strings_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: unbekanntes Deck-Format")
+        if strings_offset + strings_size > len(self._mm) or HEADER.size + n * RECORD.size > strings_offset:
+            raise ValueError(f"{path}: Deck-Datei ist beschädigt")
+        if n == 0:
+            raise ValueError(f"{path}: Deck enthält keine Einträge")
+        self._n = n
+        self._strings = strings_offset
+
+    def __len__(self):
+        return self._n
+
+    def _record(self, i):
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("deck index out of range")
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+
+    def _str(self, off, ln):
+        start = self._strings + off
+        return self._mm[start:start + ln].decode("utf-8")
+
+    def __getitem__(self, i):
+        r = self._record(i)
+        return {"roman": self._str(r[1], r[2]), "arabic": r[0],
+                "latin": self._str(r[3], r[4]), "greek": self._str(r[5], r[6])}
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self[i]
+
+    def arabic(self, i):
+        return self._record(i)[0]
+
+    def greek_key(self, i):
+        r = self._record(i)
+        return self._str(r[7], r[8])
+
+    def find(self, roman, arabic):
+        # Binärsuche über (arabic, roman); -1 wenn nicht vorhanden.
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            r = self._record(mid)
+            if (r[0], self._str(r[1], r[2])) < (arabic, roman):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n:
+            r = self._record(lo)
+            if r[0] == arabic and self._str(r[1], r[2]) == roman:
+                return lo
+        return -1
+
+    def close(self):
+        self._mm.close()
+
+
+class DeckPool:
+    # Pool aus einem gemappten Deck plus kleiner Liste hochgeladener Zusatz-Einträge.
+    # Verhält sich für random.choice/len wie die bisherige Pool-Liste.
+    def __init__(self, deck, extra=()):
+        self.deck = deck
+        self.extra = list(extra)
+
+    def __len__(self):
+        return len(self.deck) + len(self.extra)
+
+    def __getitem__(self, i):
+        n = len(self.deck)
+        if i < 0:
+            i += len(self)
+        if i < n:
+            return self.deck[i]
+        return self.extra[i - n]
+
+    def __iter__(self):
+        yield from self.deck
+        yield from self.extra
+
+    def greek_key(self, i):
+        n = len(self.deck)
+        if i < 0:
+            i += len(self)
+        if i < n:
+            return self.deck.greek_key(i)
+        return greek_key(self.extra[i - n]["greek"])
+
+    def merge(self, rows, max_rows=None):
+        # Wie merge_entries(): Duplikate über (roman, arabic) werden übersprungen.
+        # max_rows begrenzt hier nur die Zusatz-Einträge im Speicher, nicht das Deck.
+        seen = {(e["roman"], e["arabic"]) for e in self.extra}
+        extra = list(self.extra)
+        added = 0
+        for e in rows:
+            if max_rows is not None and len(extra) >= max_rows:
+                break
+            key = (e["roman"], e["arabic"])
+            if key in seen or self.deck.find(*key) >= 0:
+                continue
+            extra.append(e); seen.add(key); added += 1
+        return (DeckPool(self.deck, extra), added) if added else (self, 0)
+
+
+_open_decks = {}
+
+
+def open_deck(path):
+    # Ein Mapping pro Prozess und Datei, von allen Sessions geteilt.
+    path = os.path.abspath(path)
+    deck = _open_decks.get(path)
+    if deck is None:
+        deck = _open_decks[path] = BinaryDeck(path)
+    return deck
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="CSV/JSON-Datensätze in ein binäres Deck (.gndk) umwandeln")
+    ap.add_argument("inputs", nargs="+", help="CSV- oder JSON-Dateien")
+    ap.add_argument("-o", "--output", required=True, help="Zieldatei (.gndk)")
+    args = ap.parse_args(argv)
+    try:
+        n = convert(args.inputs, args.output)
+    except (OSError, ValueError, KeyError) as e:
+        ap.error(str(e))
+    print(f"{n} Einträge -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
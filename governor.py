@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Speicher-Governor — Obergrenzen für Uploads/Pool und Auslagern inaktiver Sessions
+#
+# Jede Session meldet sich bei jedem Durchlauf mit touch() an. Der Governor merkt sich
+# pro Session die ungefähre Größe des Pools (Bytes, Zeilen) und eine Referenz auf die
+# Pool-Liste. Pools von Sessions, die länger als IDLE_SECONDS inaktiv sind, werden als
+# JSON in SPILL_DIR ausgelagert und im Speicher geleert - bei einem gemappten Deck
+# (deck_bin.DeckPool) nur die Zusatz-Einträge, das Deck bleibt gemappt. Beim nächsten
+# touch() werden sie wieder geladen. Nach EVICT_SECONDS wird die Session ganz vergessen.
+# Wichtig: der Governor hält eine Referenz auf den Pool der Session. Wer den Pool
+# ersetzt (merge_entries/DeckPool.merge liefern bei neuen Zeilen ein neues Objekt),
+# muss danach account() aufrufen, sonst würde eine veraltete Kopie ausgelagert.
+#
+# upload_allowed() prüft eine Datei erst, nachdem Streamlit sie schon vollständig
+# empfangen hat. Die harte Grenze für den Upload selbst setzt server.maxUploadSize
+# in .streamlit/config.toml (in MB, passend zu GREEK_MAX_UPLOAD_KB halten).
+#
+# Grenzen per Umgebungsvariable einstellbar:
+#   GREEK_MAX_UPLOAD_KB, GREEK_MAX_POOL_ROWS, GREEK_IDLE_SECONDS, GREEK_EVICT_SECONDS, GREEK_SPILL_DIR
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+MAX_UPLOAD_BYTES = int(os.environ.get("GREEK_MAX_UPLOAD_KB", "2048")) * 1024
+MAX_POOL_ROWS = int(os.environ.get("GREEK_MAX_POOL_ROWS", "20000"))
+IDLE_SECONDS = float(os.environ.get("GREEK_IDLE_SECONDS", "900"))
+EVICT_SECONDS = float(os.environ.get("GREEK_EVICT_SECONDS", "21600"))
+SPILL_DIR = os.environ.get("GREEK_SPILL_DIR", os.path.join(tempfile.gettempdir(), "greek_numbers_spill"))
+SWEEP_INTERVAL = 30.0
+SPILL_MIN_BYTES = 64 * 1024   # kleine Pools lohnen das Auslagern nicht
+
+_sessions = {}   # sid -> {"pool", "rows", "bytes", "last_seen", "spilled"}
+_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+def entry_bytes(e) -> int:
+    return sys.getsizeof(e) + sum(sys.getsizeof(v) for v in e.values())
+
+
+def resident(pool):
+    # Bei einem gemappten Deck (deck_bin.DeckPool) liegen nur die Zusatz-Einträge im Speicher.
+    return getattr(pool, "extra", pool)
+
+
+def pool_bytes(pool) -> int:
+    rows = resident(pool)
+    return sys.getsizeof(rows) + sum(entry_bytes(e) for e in rows)
+
+
+def _spill_path(sid):
+    return os.path.join(SPILL_DIR, f"{sid}.json")
+
+
+# -------------------- Session-Ereignisse --------------------
+def touch(sid, pool):
+    # Bei jedem Durchlauf aufrufen. Gibt True zurück, wenn der Pool gerade
+    # aus der Auslagerung zurückgeholt wurde.
+    now = time.monotonic()
+    restored = False
+    with _lock:
+        s = _sessions.get(sid)
+        if s is None:
+            s = _sessions[sid] = {"pool": pool, "rows": len(resident(pool)), "bytes": pool_bytes(pool),
+                                  "last_seen": now, "spilled": False}
+        elif s["spilled"]:
+            restored = True
+        elif s["pool"] is not pool:
+            s["pool"] = pool
+            s["rows"] = len(resident(pool))
+            s["bytes"] = pool_bytes(pool)
+        s["last_seen"] = now
+    if restored:
+        _restore(sid, s, pool)
+    _maybe_sweep(now)
+    return restored
+
+
+def account(sid, pool):
+    # Nach jedem Upload/Merge aufrufen; ist es noch dasselbe Pool-Objekt, kostet das nichts.
+    with _lock:
+        s = _sessions.get(sid)
+        if s is not None and s["pool"] is not pool:
+            s["pool"] = pool
+            s["rows"] = len(resident(pool))
+            s["bytes"] = pool_bytes(pool)
+
+
+def forget(sid):
+    with _lock:
+        s = _sessions.pop(sid, None)
+    if s is not None and s["spilled"]:
+        try:
+            os.remove(_spill_path(sid))
+        except OSError:
+            pass
+
+
+def upload_allowed(size: int) -> bool:
+    return size <= MAX_UPLOAD_BYTES
+
+
+# -------------------- Auslagern --------------------
+# Datei-I/O läuft außerhalb von _lock, damit touch()/account() anderer Sessions nicht warten.
+def _spill(sid, pool, seen):
+    # Schreibt den Pool weg und leert ihn nur, wenn die Session seitdem nicht aktiv war.
+    try:
+        os.makedirs(SPILL_DIR, exist_ok=True)
+        with open(_spill_path(sid), "w", encoding="utf-8") as f:
+            json.dump(list(resident(pool)), f, ensure_ascii=False)
+    except OSError:
+        return
+    with _lock:
+        s = _sessions.get(sid)
+        if s is not None and s["pool"] is pool and s["last_seen"] == seen and not s["spilled"]:
+            resident(pool).clear()
+            s["spilled"] = True
+            return
+    try:
+        os.remove(_spill_path(sid))
+    except OSError:
+        pass
+
+
+def _restore(sid, s, pool):
+    try:
+        with open(_spill_path(sid), encoding="utf-8") as f:
+            rows = json.load(f)
+        os.remove(_spill_path(sid))
+    except (OSError, ValueError):
+        rows = []
+    with _lock:
+        resident(pool)[:] = rows
+        s["pool"] = pool
+        s["spilled"] = False
+
+
+def _maybe_sweep(now):
+    global _last_sweep
+    if now - _last_sweep < SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+    evict = []
+    spill = []
+    with _lock:
+        for sid, s in _sessions.items():
+            idle = now - s["last_seen"]
+            if idle > EVICT_SECONDS:
+                evict.append(sid)
+            elif idle > IDLE_SECONDS and not s["spilled"] and s["bytes"] >= SPILL_MIN_BYTES:
+                spill.append((sid, s["pool"], s["last_seen"]))
+    for sid, pool, seen in spill:
+        _spill(sid, pool, seen)
+    for sid in evict:
+        forget(sid)
+
+
+# -------------------- Debug --------------------
+def totals():
+    with _lock:
+        live = [s for s in _sessions.values() if not s["spilled"]]
+        return {
+            "sessions": len(_sessions),
+            "spilled": len(_sessions) - len(live),
+            "rows": sum(s["rows"] for s in live),
+            "bytes": sum(s["bytes"] for s in live),
+            "max_upload_bytes": MAX_UPLOAD_BYTES,
+            "max_pool_rows": MAX_POOL_ROWS,
+        }
+
+
+def session_info(sid):
+    with _lock:
+        s = _sessions.get(sid)
+        return None if s is None else {k: s[k] for k in ("rows", "bytes", "spilled")}
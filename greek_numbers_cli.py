@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Latin–Greek Numbers Quiz — Terminal-Version (ohne Streamlit, startet sofort)
+# Gleiche Daten und Bewertung wie die Streamlit-Apps (greek_numbers_core.py).
+#
+# Start:
+#   python greek_numbers_cli.py                      # Schreibmodus, polytonische Daten
+#   python greek_numbers_cli.py --mode mc -n 5       # Multiple Choice, 5 Fragen
+#   python greek_numbers_cli.py --simple extra.csv   # Daten ohne Diakritika + eigene Datei
+#   python greek_numbers_cli.py zahlen.gndk          # binäres Deck (deck_bin.py)
+#
+# Eingabe im Schreibmodus: griechische Zeichen direkt oder Beta Code, z. B.
+#   e(/c -> ἕξ,  pe/nte -> πέντε,  *e(kato/n -> Ἑκατόν
+#   )  Spiritus lenis   (  Spiritus asper   /  Akut   \  Gravis   =  Zirkumflex
+#   |  Iota subscriptum   +  Trema   *  Großbuchstabe (vor dem Buchstaben)
+
+import argparse
+import random
+import sys
+import unicodedata
+
+from greek_numbers_core import (
+    ENTRIES, BASE_ENTRIES, greek_key, matches_key, solution_key, auto_final_sigma,
+    load_csv_bytes, load_json_bytes, merge_entries,
+)
+
+# -------------------- Beta Code --------------------
+BETA_LETTERS = dict(zip("abgdezhqiklmncoprstufxyw", "αβγδεζηθικλμνξοπρστυφχψω"))
+BETA_MARKS = {
+    ")": "\u0313", "(": "\u0314", "+": "\u0308",   # Atemzeichen / Trema
+    "/": "\u0301", "\\": "\u0300", "=": "\u0342",  # Akzente
+    "|": "\u0345",                                 # Iota subscriptum
+}
+# Reihenfolge, in der NFC die Zeichen zusammensetzen kann
+MARK_ORDER = {"\u0313": 0, "\u0314": 0, "\u0308": 0, "\u0301": 1, "\u0300": 1, "\u0342": 1, "\u0345": 2}
+
+
+def beta_to_greek(text: str) -> str:
+    out = []          # Liste von [buchstabe, [zeichen...]]
+    capital = False
+    capital_marks = []
+    for ch in text:
+        low = ch.lower()
+        if ch == "*":
+            capital = True
+            capital_marks = []
+        elif ch in BETA_MARKS and capital:
+            capital_marks.append(BETA_MARKS[ch])
+        elif ch in BETA_MARKS and out and out[-1][0].isalpha():
+            out[-1][1].append(BETA_MARKS[ch])
+        elif low in BETA_LETTERS:
+            letter = BETA_LETTERS[low]
+            out.append([letter.upper() if capital else letter, capital_marks])
+            capital = False
+            capital_marks = []
+        else:
+            out.append([ch, []])
+    text = "".join(letter + "".join(sorted(marks, key=MARK_ORDER.get)) for letter, marks in out)
+    return unicodedata.normalize("NFC", auto_final_sigma(text))
+
+
+# -------------------- Daten --------------------
+def load_pool(paths, simple=False):
+    pool = list(BASE_ENTRIES if simple else ENTRIES)
+    decks = [p for p in paths if p.lower().endswith(".gndk")]
+    if len(decks) > 1:
+        raise ValueError("Nur ein binäres Deck (.gndk) auf einmal möglich")
+    if decks:
+        import deck_bin
+        pool = deck_bin.DeckPool(deck_bin.open_deck(decks[0]))
+    for p in paths:
+        if p in decks:
+            continue
+        with open(p, "rb") as f:
+            b = f.read()
+        rows = load_csv_bytes(b) if p.lower().endswith(".csv") else load_json_bytes(b)
+        if decks:
+            pool, _ = pool.merge(rows)
+        else:
+            pool, _ = merge_entries(pool, rows)
+    return pool
+
+
+def pick_options(pool, correct, rng):
+    opts = {correct}
+    while len(opts) < min(4, len(pool)):
+        opts.add(rng.choice(pool)["greek"])
+    return rng.sample(list(opts), k=len(opts))
+
+
+# -------------------- Quiz --------------------
+def ask(prompt, out):
+    out.write(prompt)
+    out.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
+
+
+def run_quiz(pool, mode="WRITE", rounds=10, rng=None, out=sys.stdout):
+    rng = rng or random.Random()
+    score = 0
+    round_i = 0
+    try:
+        for round_i in range(1, rounds + 1):
+            i = rng.randrange(len(pool))
+            e = pool[i]
+            key = solution_key(pool, i)
+            out.write(f"\nRunde {round_i}/{rounds}   •   Punkte: {score}\n")
+            out.write(f"Frage: {e['roman']} (= {e['arabic']})   |   Latein: {e['latin']}\n")
+            if mode == "MC":
+                options = pick_options(pool, e["greek"], rng)
+                labels = "ABCD"
+                for i, opt in enumerate(options):
+                    out.write(f"  {labels[i]}: {opt}\n")
+                choice = ask("Antwort (A–D): ", out).upper()
+                idx = labels.find(choice) if len(choice) == 1 else -1
+                if idx < 0 and choice.isdigit():
+                    idx = int(choice) - 1
+                answer = options[idx] if 0 <= idx < len(options) else ""
+                correct = greek_key(answer) == key
+            else:
+                answer = beta_to_greek(ask("Antwort (Altgriechisch oder Beta Code): ", out))
+                if answer:
+                    out.write(f"  → {answer}\n")
+                correct = matches_key(answer, key)
+            if correct:
+                score += 1
+                out.write("✅ Richtig!\n")
+            else:
+                out.write(f"❌ Falsch. Richtig: {e['greek']}\n")
+    except (EOFError, KeyboardInterrupt):
+        out.write("\nAbgebrochen.\n")
+        rounds = round_i - 1 if round_i else 0
+    out.write(f"\nFertig! Ergebnis: {score}/{rounds}\n")
+    return score
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Latin–Greek Numbers Quiz im Terminal")
+    ap.add_argument("files", nargs="*", help="zusätzliche CSV/JSON-Dateien oder ein .gndk-Deck")
+    ap.add_argument("--mode", choices=["write", "mc"], default="write", help="Schreibmodus oder Multiple Choice")
+    ap.add_argument("-n", "--rounds", type=int, default=10, help="Anzahl Fragen")
+    ap.add_argument("--simple", action="store_true", help="Basisdaten ohne Diakritika verwenden")
+    ap.add_argument("--seed", type=int, help="Zufallsstartwert (für reproduzierbare Durchläufe)")
+    args = ap.parse_args(argv)
+    try:
+        pool = load_pool(args.files, args.simple)
+    except (OSError, ValueError, KeyError) as e:
+        ap.error(str(e))
+    run_quiz(pool, args.mode.upper(), args.rounds, random.Random(args.seed))
+
+
+if __name__ == "__main__":
+    main()
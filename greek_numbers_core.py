@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Gemeinsame Hilfsfunktionen der Zahlen-Trainer (ohne Streamlit)
+# Datensätze, Normalisierung/Bewertung der Antworten und Laden von CSV/JSON-Dateien.
+
+import unicodedata
+import json
+import csv
+import io
+
+# -------------------- Daten --------------------
+# Polytonisch (greek_numbers_streamlit.py)
+ENTRIES = [
+    {"roman":"I","arabic":1,"latin":"unus, a, um","greek":"εἷς/μία/ἕν"},
+    {"roman":"II","arabic":2,"latin":"duo, duae, duo","greek":"δύο"},
+    {"roman":"III","arabic":3,"latin":"tres, tres, tria","greek":"τρεῖς/τρία"},
+    {"roman":"IV","arabic":4,"latin":"quattuor","greek":"τέσσαρες/τέσσαρα"},
+    {"roman":"V","arabic":5,"latin":"quinque","greek":"πέντε"},
+    {"roman":"VI","arabic":6,"latin":"sex","greek":"ἕξ"},
+    {"roman":"VII","arabic":7,"latin":"septem","greek":"ἑπτά"},
+    {"roman":"VIII","arabic":8,"latin":"octo","greek":"ὀκτώ"},
+    {"roman":"IX","arabic":9,"latin":"novem","greek":"ἐννέα"},
+    {"roman":"X","arabic":10,"latin":"decem","greek":"δέκα"},
+    {"roman":"XX","arabic":20,"latin":"viginti","greek":"εἴκοσι"},
+    {"roman":"XXX","arabic":30,"latin":"triginta","greek":"τριάκοντα"},
+    {"roman":"XL","arabic":40,"latin":"quadraginta","greek":"τεσσεράκοντα"},
+    {"roman":"L","arabic":50,"latin":"quinquaginta","greek":"πεντήκοντα"},
+    {"roman":"LX","arabic":60,"latin":"sexaginta","greek":"ἑξήκοντα"},
+    {"roman":"LXX","arabic":70,"latin":"septuaginta","greek":"ἑβδομήκοντα"},
+    {"roman":"LXXX","arabic":80,"latin":"octoginta","greek":"ὀγδοήκοντα"},
+    {"roman":"XC","arabic":90,"latin":"nonaginta","greek":"ἐνενήκοντα"},
+    {"roman":"C","arabic":100,"latin":"centum","greek":"ἑκατόν"},
+    {"roman":"D","arabic":500,"latin":"quingenti, ae, a","greek":"πεντακόσιοι/πεντακόσιαι/πεντακόσια"},
+    {"roman":"M","arabic":1000,"latin":"mille","greek":"χίλιοι/χίλιαι/χίλια"},
+]
+
+# Ohne Diakritika (einfache Tastatur)
+BASE_ENTRIES = [
+    {"roman":"I","arabic":1,"latin":"unus","greek":"εις/μια/εν"},
+    {"roman":"II","arabic":2,"latin":"duo","greek":"δυο"},
+    {"roman":"III","arabic":3,"latin":"tres","greek":"τρεις/τρια"},
+    {"roman":"IV","arabic":4,"latin":"quattuor","greek":"τεσσαρες/τεσσαρα"},
+    {"roman":"V","arabic":5,"latin":"quinque","greek":"πεντε"},
+    {"roman":"VI","arabic":6,"latin":"sex","greek":"εξ"},
+    {"roman":"VII","arabic":7,"latin":"septem","greek":"επτα"},
+    {"roman":"VIII","arabic":8,"latin":"octo","greek":"οκτω"},
+    {"roman":"IX","arabic":9,"latin":"novem","greek":"εννεα"},
+    {"roman":"X","arabic":10,"latin":"decem","greek":"δεκα"},
+    {"roman":"XX","arabic":20,"latin":"viginti","greek":"εικοσι"},
+    {"roman":"XXX","arabic":30,"latin":"triginta","greek":"τριακοντα"},
+    {"roman":"XL","arabic":40,"latin":"quadraginta","greek":"τεσσερακοντα"},
+    {"roman":"L","arabic":50,"latin":"quinquaginta","greek":"πεντηκοντα"},
+    {"roman":"LX","arabic":60,"latin":"sexaginta","greek":"εξηκοντα"},
+    {"roman":"LXX","arabic":70,"latin":"septuaginta","greek":"εβδομηκοντα"},
+    {"roman":"LXXX","arabic":80,"latin":"octoginta","greek":"ογδοηκοντα"},
+    {"roman":"XC","arabic":90,"latin":"nonaginta","greek":"ενενηκοντα"},
+    {"roman":"C","arabic":100,"latin":"centum","greek":"εκατον"},
+    {"roman":"D","arabic":500,"latin":"quingenti","greek":"πεντακοσιοι/πεντακοσιαι/πεντακοσια"},
+    {"roman":"M","arabic":1000,"latin":"mille","greek":"χιλιοι/χιλιαι/χιλια"},
+]
+
+# -------------------- Utils --------------------
+def strip_accents(s: str) -> str:
+    s = unicodedata.normalize("NFD", s)
+    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
+    s = s.replace("ς", "σ")
+    return s.lower().strip()
+
+def greek_key(greek: str) -> str:
+    # Vor-normalisierte Lösungen ("/"-getrennt), wie sie auch im binären Deck stehen
+    return "/".join(strip_accents(p) for p in greek.split("/"))
+
+def matches_key(user: str, key: str) -> bool:
+    return strip_accents(user) in key.split("/")
+
+def is_correct(user: str, solutions: str) -> bool:
+    return matches_key(user, greek_key(solutions))
+
+def solution_key(pool, i) -> str:
+    # Schlüssel für Eintrag i; ein binäres Deck liefert ihn fertig aus der Datei
+    key = getattr(pool, "greek_key", None)
+    return key(i) if key is not None else greek_key(pool[i]["greek"])
+
+def auto_final_sigma(text: str) -> str:
+    out = []
+    for i, ch in enumerate(text):
+        if ch == "σ":
+            nx = text[i+1] if i+1 < len(text) else ""
+            if nx == "" or nx.isspace() or nx in ",.;:!?)»”'’":
+                out.append("ς")
+            else:
+                out.append("σ")
+        else:
+            out.append(ch)
+    return "".join(out)
+
+def load_csv_bytes(b: bytes):
+    content = b.decode("utf-8-sig")
+    reader = csv.DictReader(io.StringIO(content))
+    required = {"roman","arabic","latin","greek"}
+    if not required.issubset(set(reader.fieldnames or [])):
+        raise ValueError("CSV braucht Spalten: roman, arabic, latin, greek")
+    rows = []
+    for row in reader:
+        try:
+            rows.append({
+                "roman": row["roman"].strip(),
+                "arabic": int(row["arabic"]),
+                "latin": row["latin"].strip(),
+                "greek": row["greek"].strip(),
+            })
+        except Exception:
+            pass
+    return rows
+
+def load_json_bytes(b: bytes):
+    data = json.loads(b.decode("utf-8"))
+    rows = []
+    for item in data:
+        rows.append({
+            "roman": str(item["roman"]).strip(),
+            "arabic": int(item["arabic"]),
+            "latin": str(item["latin"]).strip(),
+            "greek": str(item["greek"]).strip(),
+        })
+    return rows
+
+def merge_entries(base, extra, max_rows=None):
+    seen = {(e["roman"], e["arabic"]) for e in base}
+    out = list(base)
+    added = 0
+    for e in extra:
+        if max_rows is not None and len(out) >= max_rows:
+            break
+        key = (e["roman"], e["arabic"])
+        if key not in seen:
+            out.append(e); seen.add(key); added += 1
+    # Nichts Neues: dasselbe Objekt zurückgeben, damit Referenzen darauf gültig bleiben
+    return (out, added) if added else (base, 0)
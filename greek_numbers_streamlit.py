@@ -9,160 +9,21 @@
 #   pip install streamlit
 #   streamlit run greek_numbers_streamlit.py
 
-import unicodedata
 import random
+import time
+import uuid
 import streamlit as st
 
-# -------------------- Daten --------------------
-ENTRIES = [
-    {"roman":"I","arabic":1,"latin":"unus, a, um","greek":"εἷς/μία/ἕν"},
-    {"roman":"II","arabic":2,"latin":"duo, duae, duo","greek":"δύο"},
-    {"roman":"III","arabic":3,"latin":"tres, tres, tria","greek":"τρεῖς/τρία"},
-    {"roman":"IV","arabic":4,"latin":"quattuor","greek":"τέσσαρες/τέσσαρα"},
-    {"roman":"V","arabic":5,"latin":"quinque","greek":"πέντε"},
-    {"roman":"VI","arabic":6,"latin":"sex","greek":"ἕξ"},
-    {"roman":"VII","arabic":7,"latin":"septem","greek":"ἑπτά"},
-    {"roman":"VIII","arabic":8,"latin":"octo","greek":"ὀκτώ"},
-    {"roman":"IX","arabic":9,"latin":"novem","greek":"ἐννέα"},
-    {"roman":"X","arabic":10,"latin":"decem","greek":"δέκα"},
-    {"roman":"XX","arabic":20,"latin":"viginti","greek":"εἴκοσι"},
-    {"roman":"XXX","arabic":30,"latin":"triginta","greek":"τριάκοντα"},
-    {"roman":"XL","arabic":40,"latin":"quadraginta","greek":"τεσσεράκοντα"},
-    {"roman":"L","arabic":50,"latin":"quinquaginta","greek":"πεντήκοντα"},
-    {"roman":"LX","arabic":60,"latin":"sexaginta","greek":"ἑξήκοντα"},
-    {"roman":"LXX","arabic":70,"latin":"septuaginta","greek":"ἑβδομήκοντα"},
-    {"roman":"LXXX","arabic":80,"latin":"octoginta","greek":"ὀγδοήκοντα"},
-    {"roman":"XC","arabic":90,"latin":"nonaginta","greek":"ἐνενήκοντα"},
-    {"roman":"C","arabic":100,"latin":"centum","greek":"ἑκατόν"},
-    {"roman":"D","arabic":500,"latin":"quingenti, ae, a","greek":"πεντακόσιοι/πεντακόσιαι/πεντακόσια"},
-    {"roman":"M","arabic":1000,"latin":"mille","greek":"χίλιοι/χίλιαι/χίλια"},
-]
+import analytics
+import classroom
+import polytonic
+import snapshot
+from greek_numbers_core import ENTRIES, strip_accents, is_correct, auto_final_sigma
 
 VOWELS = "αεηιουω"
 CONSONANTS_ROW1 = "βγδζθκλμνξπρσ"
 CONSONANTS_ROW2 = "τυφχψς"
 
-# -------------------- Hilfsfunktionen --------------------
-def strip_accents(s: str) -> str:
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-    s = s.replace("ς", "σ")
-    return s.lower().strip()
-
-def is_correct(user: str, solutions: str) -> bool:
-    u = strip_accents(user)
-    for part in solutions.split("/"):
-        if strip_accents(part) == u:
-            return True
-    return False
-
-def auto_final_sigma(text: str) -> str:
-    out = []
-    for i, ch in enumerate(text):
-        if ch == "σ":
-            next_ch = text[i+1] if i+1 < len(text) else ""
-            if next_ch == "" or next_ch.isspace() or next_ch in ",.;:!?)»”'’":
-                out.append("ς")
-            else:
-                out.append("σ")
-        else:
-            out.append(ch)
-    return "".join(out)
-
-# -------------------- Polytonic Composer --------------------
-COMPOSE = {}
-def add(v, breath, acc, iota, diaer, ch):
-    COMPOSE[(v, breath, acc, iota, diaer)] = ch
-
-# α
-add("α", "smooth", None, False, False, "ἀ")
-add("α", "rough",  None, False, False, "ἁ")
-add("α", "smooth", "acute", False, False, "ἄ")
-add("α", "rough",  "acute", False, False, "ἅ")
-add("α", "smooth", "grave", False, False, "ἂ")
-add("α", "rough",  "grave", False, False, "ἃ")
-add("α", "smooth", "circ",  False, False, "ἆ")
-add("α", "rough",  "circ",  False, False, "ἇ")
-add("α", "smooth", None, True,  False, "ᾳ")
-add("α", "smooth", "acute", True, False, "ᾴ")
-add("α", "smooth", "grave", True, False, "ᾲ")
-add("α", "smooth", "circ",  True, False, "ᾷ")
-add("α", "rough",  None, True,  False, "ᾁ")
-add("α", "rough",  "acute", True, False, "ᾅ")
-add("α", "rough",  "grave", True, False, "ᾃ")
-add("α", "rough",  "circ",  True, False, "ᾇ")
-# ε
-add("ε", "smooth", None, False, False, "ἐ")
-add("ε", "rough",  None, False, False, "ἑ")
-add("ε", "smooth", "acute", False, False, "ἔ")
-add("ε", "rough",  "acute", False, False, "ἕ")
-add("ε", "smooth", "grave", False, False, "ἒ")
-add("ε", "rough",  "grave", False, False, "ἓ")
-# η
-add("η", "smooth", None, False, False, "ἠ")
-add("η", "rough",  None, False, False, "ἡ")
-add("η", "smooth", "acute", False, False, "ἤ")
-add("η", "rough",  "acute", False, False, "ἥ")
-add("η", "smooth", "grave", False, False, "ἢ")
-add("η", "rough",  "grave", False, False, "ἣ")
-add("η", "smooth", "circ",  False, False, "ἦ")
-add("η", "rough",  "circ",  False, False, "ἧ")
-add("η", "smooth", None, True,  False, "ῃ")
-add("η", "smooth", "acute", True, False, "ῄ")
-add("η", "smooth", "grave", True, False, "ῂ")
-add("η", "smooth", "circ",  True, False, "ῇ")
-add("η", "rough",  None, True,  False, "ᾐ")
-add("η", "rough",  "acute", True, False, "ᾔ")
-add("η", "rough",  "grave", True, False, "ᾒ")
-add("η", "rough",  "circ",  True, False, "ᾖ")
-# ι
-add("ι", "smooth", None, False, False, "ἰ")
-add("ι", "rough",  None, False, False, "ἱ")
-add("ι", "smooth", "acute", False, False, "ἴ")
-add("ι", "rough",  "acute", False, False, "ἵ")
-add("ι", "smooth", "grave", False, False, "ἲ")
-add("ι", "rough",  "grave", False, False, "ἳ")
-add("ι", "smooth", "circ",  False, False, "ἶ")
-add("ι", "rough",  "circ",  False, False, "ἷ")
-# Trema-Sonderfälle
-COMPOSE[("ι", None, None, False, True)] = "ϊ"
-COMPOSE[("ι", None, "acute", False, True)] = "ΐ"
-# ο
-add("ο", "smooth", None, False, False, "ὀ")
-add("ο", "rough",  None, False, False, "ὁ")
-add("ο", "smooth", "acute", False, False, "ὄ")
-add("ο", "rough",  "acute", False, False, "ὅ")
-add("ο", "smooth", "grave", False, False, "ὂ")
-add("ο", "rough",  "grave", False, False, "ὃ")
-# υ
-add("υ", "smooth", None, False, False, "ὐ")
-add("υ", "rough",  None, False, False, "ὑ")
-add("υ", "smooth", "acute", False, False, "ὔ")
-add("υ", "rough",  "acute", False, False, "ὕ")
-add("υ", "smooth", "grave", False, False, "ὒ")
-add("υ", "rough",  "grave", False, False, "ὓ")
-add("υ", "smooth", "circ",  False, False, "ὖ")
-add("υ", "rough",  "circ",  False, False, "ὗ")
-COMPOSE[("υ", None, None, False, True)] = "ϋ"
-COMPOSE[("υ", None, "acute", False, True)] = "ΰ"
-# ω
-add("ω", "smooth", None, False, False, "ὠ")
-add("ω", "rough",  None, False, False, "ὡ")
-add("ω", "smooth", "acute", False, False, "ὤ")
-add("ω", "rough",  "acute", False, False, "ὥ")
-add("ω", "smooth", "grave", False, False, "ὢ")
-add("ω", "rough",  "grave", False, False, "ὣ")
-add("ω", "smooth", "circ",  False, False, "ὦ")
-add("ω", "rough",  "circ",  False, False, "ὧ")
-add("ω", "smooth", None, True,  False, "ῳ")
-add("ω", "smooth", "acute", True, False, "ῴ")
-add("ω", "smooth", "grave", True, False, "ῲ")
-add("ω", "smooth", "circ",  True, False, "ῷ")
-add("ω", "rough",  None, True,  False, "ᾠ")
-add("ω", "rough",  "acute", True, False, "ᾤ")
-add("ω", "rough",  "grave", True, False, "ᾢ")
-add("ω", "rough",  "circ",  True, False, "ᾦ")
-
 # -------------------- State --------------------
 def init_state():
     st.session_state.setdefault("started", False)
@@ -171,11 +32,15 @@ def init_state():
     st.session_state.setdefault("round_i", 0)
     st.session_state.setdefault("score", 0)
     st.session_state.setdefault("current", None)
+    st.session_state.setdefault("current_i", None)
     st.session_state.setdefault("options", [])
     st.session_state.setdefault("answer", "")
     st.session_state.setdefault("feedback", "")
     st.session_state.setdefault("await_next", False)
     st.session_state.setdefault("auto_final_sigma", True)
+    st.session_state.setdefault("sid", uuid.uuid4().hex)
+    st.session_state.setdefault("room", "")
+    st.session_state.setdefault("student_name", "")
     st.session_state.setdefault("breath", None)
     st.session_state.setdefault("accent", None)
     st.session_state.setdefault("iota", False)
@@ -183,13 +48,48 @@ def init_state():
 
 init_state()
 
+# Fortsetzen nach Server-Neustart (Link mit ?resume=<token>)
+resume = st.query_params.get("resume")
+if "resume_token" not in st.session_state:
+    if resume and snapshot.restore(resume, st.session_state, "ENTRIES", ENTRIES):
+        st.toast("Sitzung wiederhergestellt.")
+    st.session_state.resume_token = resume if snapshot.valid_token(resume) else snapshot.new_token()
+    st.query_params["resume"] = st.session_state.resume_token
+
 # -------------------- Sidebar --------------------
 st.sidebar.title("Einstellungen")
-mode_label = st.sidebar.radio("Modus", ["Multiple Choice", "Schreibmodus"], index=1)
+mode_label = st.sidebar.radio("Modus", ["Multiple Choice", "Schreibmodus"],
+                              index=0 if st.session_state.mode == "MC" else 1)
 st.session_state.mode = "MC" if mode_label == "Multiple Choice" else "WRITE"
 st.session_state.rounds = st.sidebar.slider("Anzahl Fragen", 5, 50, st.session_state.rounds)
 st.session_state.auto_final_sigma = st.sidebar.checkbox("σ → ς am Wortende", value=st.session_state.auto_final_sigma)
 
+# Klassenzimmer (Live-Rangliste für die Lehrkraft)
+st.sidebar.markdown("### Klassenzimmer")
+st.session_state.room = st.sidebar.text_input("Raumcode", value=st.session_state.room)
+st.session_state.student_name = st.sidebar.text_input("Dein Name", value=st.session_state.student_name)
+room = None
+if st.session_state.room.strip() and st.session_state.student_name.strip():
+    room = classroom.get_room(st.session_state.room)
+    if room is None:
+        st.sidebar.warning("Dieser Raum wurde von der Lehrkraft geschlossen.")
+    else:
+        room.join(st.session_state.sid, st.session_state.student_name.strip(),
+                  st.session_state.score, st.session_state.round_i, st.session_state.rounds)
+joined = st.session_state.get("joined_room", "")
+if joined and (room is None or joined != room.code):
+    old_room = classroom.get_room(joined, create=False)
+    if old_room is not None:
+        old_room.leave(st.session_state.sid)
+st.session_state.joined_room = room.code if room is not None else ""
+
+def report_answer(e, correct, answer):
+    shown_at = st.session_state.get("shown_at")
+    seconds = time.monotonic() - shown_at if shown_at is not None else None
+    analytics.record(e["roman"], e["greek"], correct, strip_accents(answer), seconds)
+    if room is not None:
+        room.record(st.session_state.sid, e["roman"], correct, st.session_state.round_i)
+
 colA, colB = st.sidebar.columns(2)
 if colA.button("Start", use_container_width=True):
     st.session_state.started = True
@@ -200,7 +100,13 @@ if colA.button("Start", use_container_width=True):
     st.session_state.answer = ""
     st.session_state.current = None
     st.session_state.options = []
+    if room is not None:
+        room.start(st.session_state.sid, st.session_state.rounds)
 if colB.button("Reset", use_container_width=True):
+    snapshot.discard(st.session_state.get("resume_token"))
+    st.query_params.clear()
+    if room is not None:
+        room.leave(st.session_state.sid)
     for k in list(st.session_state.keys()):
         del st.session_state[k]
     st.rerun()
@@ -210,10 +116,12 @@ st.caption("Im Schreibmodus auf der polytonischen Bildschirmtastatur Altgriechis
 
 # -------------------- Helpers --------------------
 def pick_new_question():
-    st.session_state.current = random.choice(ENTRIES)
+    st.session_state.current_i = random.randrange(len(ENTRIES))
+    st.session_state.current = ENTRIES[st.session_state.current_i]
     st.session_state.answer = ""
     st.session_state.feedback = ""
     st.session_state.await_next = False
+    st.session_state.shown_at = time.monotonic()
     if st.session_state.mode == "MC":
         correct = st.session_state.current["greek"]
         opts = {correct}
@@ -242,7 +150,9 @@ if st.session_state.started:
         cols = st.columns(2)
         for i, opt in enumerate(st.session_state.options):
             if cols[i%2].button(opt, key=f"mc_{i}", use_container_width=True, disabled=st.session_state.await_next):
-                if opt == e["greek"]:
+                correct = opt == e["greek"]
+                report_answer(e, correct, opt)
+                if correct:
                     st.session_state.score += 1
                     st.session_state.feedback = "✅ Richtig!"
                 else:
@@ -292,11 +202,9 @@ if st.session_state.started:
         cv = st.columns(len(VOWELS))
         for i, v in enumerate(VOWELS):
             if cv[i].button(v, key=f"v_{v}"):
-                ch = COMPOSE.get((v, st.session_state.breath, st.session_state.accent, st.session_state.iota, st.session_state.diaer))
-                if ch is None and v in ("ι","υ") and st.session_state.diaer and st.session_state.accent in (None, "acute"):
-                    ch = COMPOSE.get((v, None, st.session_state.accent or None, False, True))
-                if ch is None:
-                    ch = v
+                # Trema und Atemzeichen schließen sich aus
+                breath = None if st.session_state.diaer else st.session_state.breath
+                ch = polytonic.compose(v, breath, st.session_state.accent, st.session_state.iota, st.session_state.diaer)
                 st.session_state.answer += ch
                 if st.session_state.auto_final_sigma:
                     st.session_state.answer = auto_final_sigma(st.session_state.answer)
@@ -305,6 +213,8 @@ if st.session_state.started:
         cr1 = st.columns(len(CONSONANTS_ROW1))
         for i, c in enumerate(CONSONANTS_ROW1):
             if cr1[i].button(c, key=f"c1_{c}"):
+                if c == "ρ":
+                    c = polytonic.compose(c, st.session_state.breath)
                 st.session_state.answer += c
                 if st.session_state.auto_final_sigma:
                     st.session_state.answer = auto_final_sigma(st.session_state.answer)
@@ -328,9 +238,16 @@ if st.session_state.started:
 
         col_ok, col_next = st.columns(2)
         if col_ok.button("Prüfen", disabled=st.session_state.await_next):
-            if is_correct(st.session_state.answer, e["greek"]):
+            correct = is_correct(st.session_state.answer, e["greek"])
+            report_answer(e, correct, st.session_state.answer)
+            if correct:
                 st.session_state.score += 1
                 st.session_state.feedback = "✅ Richtig!"
+                for part in e["greek"].split("/"):
+                    hints = polytonic.diacritic_feedback(st.session_state.answer, part)
+                    if hints:
+                        st.session_state.feedback += f" Diakritika ({part}): " + "; ".join(hints)
+                        break
             else:
                 st.session_state.feedback = f"❌ Falsch. Richtig: {e['greek']}"
             st.session_state.await_next = True
@@ -341,3 +258,5 @@ if st.session_state.started:
 else:
     st.info("Wähle links den Modus und klicke **Start**.")
     st.markdown("- **Multiple Choice**: eine von vier griechischen Antworten wählen.\n- **Schreibmodus**: Altgriechisch mit polytonischer Bildschirmtastatur eingeben.\n- Vergleich ist akzent‑tolerant; optionale automatische Umwandlung **σ→ς** am Wortende.")
+
+snapshot.save(st.session_state.resume_token, st.session_state, "ENTRIES", ENTRIES)
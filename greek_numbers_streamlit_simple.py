@@ -3,134 +3,97 @@
 # Run:
 #   pip install streamlit
 #   streamlit run greek_numbers_streamlit_simple.py
+# Großes Deck (siehe deck_bin.py):
+#   GREEK_DECK=zahlen.gndk streamlit run greek_numbers_streamlit_simple.py
 
-import unicodedata
-import json
-import csv
-import io
+import os
 import random
+import time
+import uuid
 import streamlit as st
 
-# -------------------- Base data --------------------
-BASE_ENTRIES = [
-    {"roman":"I","arabic":1,"latin":"unus","greek":"εις/μια/εν"},
-    {"roman":"II","arabic":2,"latin":"duo","greek":"δυο"},
-    {"roman":"III","arabic":3,"latin":"tres","greek":"τρεις/τρια"},
-    {"roman":"IV","arabic":4,"latin":"quattuor","greek":"τεσσαρες/τεσσαρα"},
-    {"roman":"V","arabic":5,"latin":"quinque","greek":"πεντε"},
-    {"roman":"VI","arabic":6,"latin":"sex","greek":"εξ"},
-    {"roman":"VII","arabic":7,"latin":"septem","greek":"επτα"},
-    {"roman":"VIII","arabic":8,"latin":"octo","greek":"οκτω"},
-    {"roman":"IX","arabic":9,"latin":"novem","greek":"εννεα"},
-    {"roman":"X","arabic":10,"latin":"decem","greek":"δεκα"},
-    {"roman":"XX","arabic":20,"latin":"viginti","greek":"εικοσι"},
-    {"roman":"XXX","arabic":30,"latin":"triginta","greek":"τριακοντα"},
-    {"roman":"XL","arabic":40,"latin":"quadraginta","greek":"τεσσερακοντα"},
-    {"roman":"L","arabic":50,"latin":"quinquaginta","greek":"πεντηκοντα"},
-    {"roman":"LX","arabic":60,"latin":"sexaginta","greek":"εξηκοντα"},
-    {"roman":"LXX","arabic":70,"latin":"septuaginta","greek":"εβδομηκοντα"},
-    {"roman":"LXXX","arabic":80,"latin":"octoginta","greek":"ογδοηκοντα"},
-    {"roman":"XC","arabic":90,"latin":"nonaginta","greek":"ενενηκοντα"},
-    {"roman":"C","arabic":100,"latin":"centum","greek":"εκατον"},
-    {"roman":"D","arabic":500,"latin":"quingenti","greek":"πεντακοσιοι/πεντακοσιαι/πεντακοσια"},
-    {"roman":"M","arabic":1000,"latin":"mille","greek":"χιλιοι/χιλιαι/χιλια"},
-]
+import analytics
+import classroom
+import deck_bin
+import governor
+import snapshot
+from greek_numbers_core import (
+    BASE_ENTRIES, strip_accents, greek_key, matches_key, solution_key, auto_final_sigma,
+    load_csv_bytes, load_json_bytes, merge_entries,
+)
 
 VOWELS = "αεηιουω"
 CONSONANTS_ROW1 = "βγδεζηθικλμνξ"
 CONSONANTS_ROW2 = "οπρσςτυφχψω"
 
-TEMPLATE_CSV = "roman,arabic,latin,greek\nI,1,unus,εις/μια/εν\nIV,4,quattuor,τεσσαρες/τεσσαρα\nX,10,decem,δεκα\n"
+# Optional: großes binäres Deck (siehe deck_bin.py) statt der Basisdaten
+DECK_PATH = os.environ.get("GREEK_DECK")
+DECK_ERROR = None
+if DECK_PATH:
+    try:
+        deck_bin.open_deck(DECK_PATH)
+    except (OSError, ValueError) as e:
+        DECK_ERROR = f"Deck nicht nutzbar ({e}) – es werden die Basisdaten verwendet."
+        DECK_PATH = None
 
-# -------------------- Utils --------------------
-def strip_accents(s: str) -> str:
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-    s = s.replace("ς", "σ")
-    return s.lower().strip()
-
-def is_correct(user: str, solutions: str) -> bool:
-    u = strip_accents(user)
-    for part in solutions.split("/"):
-        if strip_accents(part) == u:
-            return True
-    return False
-
-def auto_final_sigma(text: str) -> str:
-    out = []
-    for i, ch in enumerate(text):
-        if ch == "σ":
-            nx = text[i+1] if i+1 < len(text) else ""
-            if nx == "" or nx.isspace() or nx in ",.;:!?)»”'’":
-                out.append("ς")
-            else:
-                out.append("σ")
-        else:
-            out.append(ch)
-    return "".join(out)
-
-def load_csv_bytes(b: bytes):
-    content = b.decode("utf-8-sig")
-    reader = csv.DictReader(io.StringIO(content))
-    required = {"roman","arabic","latin","greek"}
-    if not required.issubset(set(reader.fieldnames or [])):
-        raise ValueError("CSV braucht Spalten: roman, arabic, latin, greek")
-    rows = []
-    for row in reader:
-        try:
-            rows.append({
-                "roman": row["roman"].strip(),
-                "arabic": int(row["arabic"]),
-                "latin": row["latin"].strip(),
-                "greek": row["greek"].strip(),
-            })
-        except Exception:
-            pass
-    return rows
-
-def load_json_bytes(b: bytes):
-    data = json.loads(b.decode("utf-8"))
-    rows = []
-    for item in data:
-        rows.append({
-            "roman": str(item["roman"]).strip(),
-            "arabic": int(item["arabic"]),
-            "latin": str(item["latin"]).strip(),
-            "greek": str(item["greek"]).strip(),
-        })
-    return rows
-
-def merge_entries(base, extra):
-    seen = {(e["roman"], e["arabic"]) for e in base}
-    out = list(base)
-    added = 0
-    for e in extra:
-        key = (e["roman"], e["arabic"])
-        if key not in seen:
-            out.append(e); seen.add(key); added += 1
-    return out, added
+TEMPLATE_CSV = "roman,arabic,latin,greek\nI,1,unus,εις/μια/εν\nIV,4,quattuor,τεσσαρες/τεσσαρα\nX,10,decem,δεκα\n"
 
 # -------------------- Session State --------------------
+def pool_base():
+    # (Name, Basis-Sequenz) für Snapshots; der Pool beginnt immer mit dieser Basis
+    if DECK_PATH:
+        return f"deck:{DECK_PATH}", deck_bin.open_deck(DECK_PATH)
+    return "BASE_ENTRIES", BASE_ENTRIES
+
+def pool_with_extras(extras):
+    if DECK_PATH:
+        return deck_bin.DeckPool(deck_bin.open_deck(DECK_PATH), extras)
+    return list(BASE_ENTRIES) + extras
+
+def default_pool():
+    return pool_with_extras([])
+
 def init_state():
-    st.session_state.setdefault("pool", list(BASE_ENTRIES))
+    if "pool" not in st.session_state:
+        st.session_state.pool = default_pool()
     st.session_state.setdefault("started", False)
     st.session_state.setdefault("mode", "WRITE")
     st.session_state.setdefault("rounds", 10)
     st.session_state.setdefault("round_i", 0)
     st.session_state.setdefault("score", 0)
     st.session_state.setdefault("current", None)
+    st.session_state.setdefault("current_i", None)
     st.session_state.setdefault("options", [])
     st.session_state.setdefault("answer", "")
     st.session_state.setdefault("feedback", "")
     st.session_state.setdefault("await_next", False)
     st.session_state.setdefault("auto_final_sigma", True)
+    st.session_state.setdefault("sid", uuid.uuid4().hex)
+    st.session_state.setdefault("room", "")
+    st.session_state.setdefault("student_name", "")
 
 init_state()
 
+# Fortsetzen nach Server-Neustart (Link mit ?resume=<token>)
+resume = st.query_params.get("resume")
+if "resume_token" not in st.session_state:
+    if resume and snapshot.restore(resume, st.session_state, *pool_base(), pool_with_extras):
+        st.toast("Sitzung wiederhergestellt.")
+    st.session_state.resume_token = resume if snapshot.valid_token(resume) else snapshot.new_token()
+    st.query_params["resume"] = st.session_state.resume_token
+if governor.touch(st.session_state.sid, st.session_state.pool):
+    st.toast("Deine Datensätze wurden wieder geladen.")
+if not st.session_state.pool:
+    # Pool wurde wegen Inaktivität verworfen
+    st.session_state.pool = default_pool()
+    governor.account(st.session_state.sid, st.session_state.pool)
+    st.session_state.current = None
+
 # -------------------- Sidebar --------------------
 st.sidebar.title("Einstellungen")
 
-mode_label = st.sidebar.radio("Modus", ["Multiple Choice", "Schreibmodus"], index=1)
+mode_label = st.sidebar.radio("Modus", ["Multiple Choice", "Schreibmodus"],
+                              index=0 if st.session_state.mode == "MC" else 1)
 st.session_state.mode = "MC" if mode_label == "Multiple Choice" else "WRITE"
 
 st.session_state.rounds = st.sidebar.slider("Anzahl Fragen", 5, 100, st.session_state.rounds)
@@ -143,6 +106,9 @@ if uploads:
     all_new = []
     errors = []
     for up in uploads:
+        if not governor.upload_allowed(up.size):
+            errors.append(f"{up.name}: größer als {governor.MAX_UPLOAD_BYTES // 1024} KB")
+            continue
         try:
             if up.name.lower().endswith(".csv"):
                 rows = load_csv_bytes(up.read())
@@ -154,8 +120,41 @@ if uploads:
     if errors:
         st.sidebar.warning("Einige Dateien konnten nicht geladen werden:\n" + "\n".join(errors))
     if all_new:
-        st.session_state.pool, added = merge_entries(st.session_state.pool, all_new)
+        if isinstance(st.session_state.pool, deck_bin.DeckPool):
+            st.session_state.pool, added = st.session_state.pool.merge(all_new, governor.MAX_POOL_ROWS)
+        else:
+            st.session_state.pool, added = merge_entries(st.session_state.pool, all_new, governor.MAX_POOL_ROWS)
+        # auch ohne neue Zeilen: der Governor muss den aktuellen Pool kennen
+        governor.account(st.session_state.sid, st.session_state.pool)
         st.sidebar.success(f"{len(all_new)} Zeilen gelesen, {added} neu. Gesamt: {len(st.session_state.pool)}")
+        if len(governor.resident(st.session_state.pool)) >= governor.MAX_POOL_ROWS:
+            st.sidebar.warning(f"Maximal {governor.MAX_POOL_ROWS} Einträge pro Sitzung – weitere Zeilen wurden ignoriert.")
+
+# Klassenzimmer (Live-Rangliste für die Lehrkraft)
+st.sidebar.markdown("### Klassenzimmer")
+st.session_state.room = st.sidebar.text_input("Raumcode", value=st.session_state.room)
+st.session_state.student_name = st.sidebar.text_input("Dein Name", value=st.session_state.student_name)
+room = None
+if st.session_state.room.strip() and st.session_state.student_name.strip():
+    room = classroom.get_room(st.session_state.room)
+    if room is None:
+        st.sidebar.warning("Dieser Raum wurde von der Lehrkraft geschlossen.")
+    else:
+        room.join(st.session_state.sid, st.session_state.student_name.strip(),
+                  st.session_state.score, st.session_state.round_i, st.session_state.rounds)
+joined = st.session_state.get("joined_room", "")
+if joined and (room is None or joined != room.code):
+    old_room = classroom.get_room(joined, create=False)
+    if old_room is not None:
+        old_room.leave(st.session_state.sid)
+st.session_state.joined_room = room.code if room is not None else ""
+
+def report_answer(e, correct, answer):
+    shown_at = st.session_state.get("shown_at")
+    seconds = time.monotonic() - shown_at if shown_at is not None else None
+    analytics.record(e["roman"], e["greek"], correct, strip_accents(answer), seconds)
+    if room is not None:
+        room.record(st.session_state.sid, e["roman"], correct, st.session_state.round_i)
 
 st.sidebar.download_button(
     "CSV-Vorlage herunterladen",
@@ -174,19 +173,36 @@ if colA.button("Start", use_container_width=True):
     st.session_state.answer = ""
     st.session_state.current = None
     st.session_state.options = []
+    if room is not None:
+        room.start(st.session_state.sid, st.session_state.rounds)
 if colB.button("Reset", use_container_width=True):
+    snapshot.discard(st.session_state.get("resume_token"))
+    st.query_params.clear()
+    if room is not None:
+        room.leave(st.session_state.sid)
+    governor.forget(st.session_state.sid)
     for k in list(st.session_state.keys()):
         del st.session_state[k]
     st.rerun()
 
 # -------------------- Main --------------------
 st.title("Greek–Latin Numbers Trainer (Streamlit) — einfache griechische Tastatur")
+if DECK_ERROR:
+    st.warning(DECK_ERROR)
+
+def current_key():
+    # Normalisierte Lösung der aktuellen Frage; ein Deck liefert sie fertig aus der Datei
+    if st.session_state.current_i is None:
+        return greek_key(st.session_state.current["greek"])
+    return solution_key(st.session_state.pool, st.session_state.current_i)
 
 def pick_new_question():
-    st.session_state.current = random.choice(st.session_state.pool)
+    st.session_state.current_i = random.randrange(len(st.session_state.pool))
+    st.session_state.current = st.session_state.pool[st.session_state.current_i]
     st.session_state.answer = ""
     st.session_state.feedback = ""
     st.session_state.await_next = False
+    st.session_state.shown_at = time.monotonic()
     if st.session_state.mode == "MC":
         correct = st.session_state.current["greek"]
         opts = {correct}
@@ -219,7 +235,9 @@ else:
         for i, opt in enumerate(st.session_state.options):
             label = labels[i] if i < len(labels) else str(i+1)
             if cols[i % 2].button(f"{label}: {opt}", key=f"mc_{i}", use_container_width=True, disabled=st.session_state.await_next):
-                if strip_accents(opt) == strip_accents(e["greek"]):
+                correct = greek_key(opt) == current_key()
+                report_answer(e, correct, opt)
+                if correct:
                     st.session_state.score += 1
                     st.session_state.feedback = "✅ Richtig!"
                 else:
@@ -269,7 +287,9 @@ else:
 
         col_ok, col_next = st.columns(2)
         if col_ok.button("Prüfen", disabled=st.session_state.await_next):
-            if is_correct(st.session_state.answer, e["greek"]):
+            correct = matches_key(st.session_state.answer, current_key())
+            report_answer(e, correct, st.session_state.answer)
+            if correct:
                 st.session_state.score += 1
                 st.session_state.feedback = "✅ Richtig!"
             else:
@@ -280,6 +300,17 @@ else:
 
         st.info(st.session_state.feedback or "Schreibe die griechische Zahl und klicke **Prüfen**.")
 
+if st.query_params.get("debug"):
+    with st.sidebar.expander("Speicher (Debug)"):
+        t = governor.totals()
+        st.write(f"Sessions: {t['sessions']} (ausgelagert: {t['spilled']})")
+        st.write(f"Pool-Zeilen im Speicher: {t['rows']}")
+        st.write(f"Pool-Speicher ca.: {t['bytes'] / 1024:.0f} KB")
+        st.write(f"Limits: Upload {t['max_upload_bytes'] // 1024} KB, Pool {t['max_pool_rows']} Zeilen")
+        me = governor.session_info(st.session_state.sid)
+        if me:
+            st.write(f"Diese Session: {me['rows']} Zeilen, ca. {me['bytes'] / 1024:.0f} KB")
+
 with st.expander("Hilfe & Dateiformate"):
     st.markdown("""
 **CSV** braucht die Spalten: `roman, arabic, latin, greek`  
@@ -294,3 +325,5 @@ Die Auswertung ignoriert Diakritika und behandelt `σ` und `ς` als gleich.
 ]
 ```
 """)
+
+snapshot.save(st.session_state.resume_token, st.session_state, *pool_base(), st.session_state.pool)
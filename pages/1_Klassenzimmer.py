@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Klassenzimmer — Live-Rangliste für die Lehrkraft
+# Liest nur die inkrementellen Aggregate aus classroom.py, keine Sessions.
+# Die Seite ist auch in der Navigation der Schüler sichtbar; Verwaltungsaktionen
+# verlangen deshalb den Lehrer-Schlüssel (GREEK_TEACHER_KEY).
+
+import streamlit as st
+
+import classroom
+
+st.title("Klassenzimmer — Live-Rangliste")
+
+codes = classroom.room_codes()
+if not codes:
+    st.info("Noch kein Raum aktiv. Schüler geben links im Quiz einen **Raumcode** und ihren Namen ein.")
+    st.stop()
+
+code = st.selectbox("Raum", codes)
+top_n = st.slider("Plätze anzeigen", 3, 50, classroom.TOP_N)
+
+with st.expander("Verwaltung (Lehrkraft)"):
+    if not classroom.TEACHER_KEY:
+        st.caption("Gesperrt: GREEK_TEACHER_KEY ist auf dem Server nicht gesetzt.")
+    key = st.text_input("Lehrer-Schlüssel", type="password", disabled=not classroom.TEACHER_KEY)
+    locked = not classroom.teacher_ok(key)
+    col_prune, col_close = st.columns(2)
+    if col_prune.button(f"Inaktive entfernen (> {classroom.IDLE_SECONDS / 60:.0f} min)", disabled=locked) and not locked:
+        room = classroom.get_room(code, create=False)
+        removed = room.prune() if room is not None else 0
+        st.toast(f"{removed} inaktive Schüler entfernt.")
+    if col_close.button("Raum schließen", disabled=locked) and not locked:
+        classroom.close_room(code)
+        st.rerun()
+
+@st.fragment(run_every=2)
+def live_view():
+    room = classroom.get_room(code, create=False)
+    if room is None:
+        st.warning("Raum nicht mehr vorhanden.")
+        return
+    t = room.totals()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Schüler", t["students"])
+    c2.metric("Antworten", t["answered"])
+    c3.metric("Trefferquote", f"{t['accuracy']:.0%}")
+    st.subheader("Rangliste")
+    st.table(room.leaderboard(top_n))
+    st.subheader("Trefferquote pro Aufgabe")
+    stats = room.item_stats()
+    st.table([{"Aufgabe": item, "Versuche": a, "Richtig": c, "Quote": f"{q:.0%}"}
+              for item, (a, c, q) in sorted(stats.items(), key=lambda kv: kv[1][2])])
+
+live_view()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Aufgaben-Analyse — welche Zahlen machen die meisten Probleme?
+# Daten kommen inkrementell aus analytics.py (alle Sessions dieses Prozesses).
+# Zurücksetzen betrifft alle Klassen und verlangt den Lehrer-Schlüssel (GREEK_TEACHER_KEY).
+
+import streamlit as st
+
+import analytics
+import classroom
+
+st.title("Aufgaben-Analyse")
+st.caption("Schwierigste Aufgaben zuerst. Fehler sind normalisiert (ohne Diakritika, σ = ς); "
+           "die Zahl in Klammern gibt an, wie oft die Antwort mindestens vorkam.")
+
+data = analytics.rows()
+if not data:
+    st.info("Noch keine Antworten. Die Statistik füllt sich, sobald im Quiz **Prüfen** geklickt wird.")
+    st.stop()
+
+st.dataframe(data, use_container_width=True, hide_index=True)
+
+col_dl, col_reset = st.columns(2)
+col_dl.download_button(
+    "Als CSV herunterladen",
+    data=analytics.to_csv(),
+    file_name="greek_numbers_analyse.csv",
+    mime="text/csv"
+)
+with col_reset.popover("Statistik zurücksetzen", disabled=not classroom.TEACHER_KEY,
+                       help=None if classroom.TEACHER_KEY else "Gesperrt: GREEK_TEACHER_KEY ist nicht gesetzt."):
+    key = st.text_input("Lehrer-Schlüssel", type="password")
+    if st.button("Alle Antworten löschen", disabled=not classroom.teacher_ok(key)) and classroom.teacher_ok(key):
+        analytics.reset()
+        st.rerun()
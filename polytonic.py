@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Polytonische Zeichen — Zusammensetzen und Zerlegen, aus unicodedata abgeleitet
+#
+# Schlüssel wie im Composer der App: (basis, atem, akzent, iota, trema)
+#   atem   : None | "smooth" | "rough"
+#   akzent : None | "acute" | "grave" | "circ"
+#   iota, trema : bool
+# Die Tabellen werden beim ersten Zugriff einmal berechnet (wenige ms) und als
+# unveränderliche Mappings gecacht; Nachschlagen ist O(1).
+
+import functools
+import unicodedata
+from types import MappingProxyType
+
+BASES = "αεηιουωρ" + "ΑΕΗΙΟΥΩΡ"
+BREATHS = {"smooth": "\u0313", "rough": "\u0314"}
+ACCENTS = {"acute": "\u0301", "grave": "\u0300", "circ": "\u0342"}
+IOTA = "\u0345"
+DIAER = "\u0308"
+
+_MARKS = {v: ("breath", k) for k, v in BREATHS.items()}
+_MARKS.update({v: ("accent", k) for k, v in ACCENTS.items()})
+_MARKS[IOTA] = ("iota", True)
+_MARKS[DIAER] = ("diaer", True)
+
+BREATH_NAMES = {"smooth": "Spiritus lenis", "rough": "Spiritus asper"}
+ACCENT_NAMES = {"acute": "Akut", "grave": "Gravis", "circ": "Zirkumflex"}
+
+
+def _sequence(base, breath, accent, iota, diaer):
+    # Kanonische NFD-Reihenfolge: Trema/Atem, dann Akzent, dann Iota subscriptum
+    return (base + (DIAER if diaer else "") + BREATHS.get(breath, "")
+            + ACCENTS.get(accent, "") + (IOTA if iota else ""))
+
+
+def _parse(ch):
+    # Zerlegt ein Zeichen per NFD; None, wenn es andere Zeichen als unsere Diakritika trägt.
+    d = unicodedata.normalize("NFD", ch)
+    key = {"breath": None, "accent": None, "iota": False, "diaer": False}
+    for m in d[1:]:
+        kind = _MARKS.get(m)
+        if kind is None:
+            return None
+        key[kind[0]] = kind[1]
+    return (d[0], key["breath"], key["accent"], key["iota"], key["diaer"])
+
+
+@functools.lru_cache(maxsize=None)
+def _tables():
+    compose = {}
+    for base in BASES:
+        for breath in (None, "smooth", "rough"):
+            for accent in (None, "acute", "grave", "circ"):
+                for iota in (False, True):
+                    for diaer in (False, True):
+                        seq = _sequence(base, breath, accent, iota, diaer)
+                        ch = unicodedata.normalize("NFC", seq)
+                        if len(ch) == 1 and ch != base:
+                            compose[(base, breath, accent, iota, diaer)] = ch
+    decompose = {}
+    for cp in list(range(0x0370, 0x0400)) + list(range(0x1F00, 0x2000)):
+        ch = chr(cp)
+        if unicodedata.category(ch) not in ("Ll", "Lu", "Lt"):
+            continue
+        key = _parse(ch)
+        if key is not None and key[0] != ch and key[0] in BASES:
+            decompose[ch] = key
+    return MappingProxyType(compose), MappingProxyType(decompose)
+
+
+def compose_table():
+    return _tables()[0]
+
+
+def decompose_table():
+    return _tables()[1]
+
+
+def compose(base, breath=None, accent=None, iota=False, diaer=False) -> str:
+    # Vorkomponiertes Zeichen, sonst die NFC-Folge mit kombinierenden Zeichen
+    # (z. B. Trema + Atemzeichen, das Unicode nicht vorkomponiert kennt).
+    ch = _tables()[0].get((base, breath, accent, iota, diaer))
+    if ch is None:
+        ch = unicodedata.normalize("NFC", _sequence(base, breath, accent, iota, diaer))
+    return ch
+
+
+def decompose(ch):
+    key = _tables()[1].get(ch)
+    if key is None:
+        key = _parse(ch) or (ch, None, None, False, False)
+    return key
+
+
+# -------------------- Rückmeldung pro Diakritikum --------------------
+def letters(text: str):
+    # Liste der (basis, atem, akzent, iota, trema) pro Buchstabe
+    out = []
+    for ch in unicodedata.normalize("NFC", text):
+        kind = _MARKS.get(ch)
+        if kind is not None and out:
+            b, br, ac, io, di = out[-1]
+            key = {"breath": br, "accent": ac, "iota": io, "diaer": di}
+            key[kind[0]] = kind[1]
+            out[-1] = (b, key["breath"], key["accent"], key["iota"], key["diaer"])
+        else:
+            out.append(decompose(ch))
+    return out
+
+
+def _base_key(b):
+    b = b.lower()
+    return "σ" if b == "ς" else b
+
+
+def diacritic_feedback(answer: str, solution: str):
+    # Hinweise für eine Antwort, deren Buchstaben stimmen, deren Diakritika aber nicht.
+    # Leere Liste, wenn alles stimmt oder die Buchstaben schon abweichen.
+    a, s = letters(answer.strip()), letters(solution.strip())
+    if len(a) != len(s) or any(_base_key(x[0]) != _base_key(y[0]) for x, y in zip(a, s)):
+        return []
+    hints = []
+    for pos, (x, y) in enumerate(zip(a, s), 1):
+        where = f"{y[0]} ({pos}. Zeichen)"
+        if x[1] != y[1]:
+            if y[1] is None:
+                hints.append(f"{where}: kein {BREATH_NAMES[x[1]]}")
+            elif x[1] is None:
+                hints.append(f"{where}: {BREATH_NAMES[y[1]]} fehlt")
+            else:
+                hints.append(f"{where}: {BREATH_NAMES[y[1]]} statt {BREATH_NAMES[x[1]]}")
+        if x[2] != y[2]:
+            if y[2] is None:
+                hints.append(f"{where}: kein Akzent")
+            elif x[2] is None:
+                hints.append(f"{where}: {ACCENT_NAMES[y[2]]} fehlt")
+            else:
+                hints.append(f"{where}: {ACCENT_NAMES[y[2]]} statt {ACCENT_NAMES[x[2]]}")
+        if x[3] != y[3]:
+            hints.append(f"{where}: Iota subscriptum {'fehlt' if y[3] else 'zu viel'}")
+        if x[4] != y[4]:
+            hints.append(f"{where}: Trema {'fehlt' if y[4] else 'zu viel'}")
+    return hints
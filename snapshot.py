@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# Sitzungs-Snapshots — Quiz nach Neustart/Redeploy des Servers fortsetzen
+#
+# Am Ende jedes Durchlaufs wird der Quiz-Zustand als kompaktes, versioniertes JSON
+# in eine Warteschlange gelegt; ein Hintergrund-Thread schreibt ihn in den
+# Zustands-Speicher (state_backend.py: Dateien, SQLite für mehrere Prozesse, ...).
+# Der Pool wird nicht kopiert: Basisdaten werden über ihren Namen referenziert,
+# hochgeladene Zusatz-Einträge einmalig als inhaltsadressierter Blob abgelegt.
+# Die aktuelle Frage wird als (Index im Pool, Eintrags-Hash) gespeichert und beim
+# Laden gegen den Hash geprüft.
+# Wiederhergestellt wird erst, wenn ein Schüler mit ?resume=<token> zurückkommt.
+#
+# Einstellbar per Umgebungsvariable: GREEK_STATE_BACKEND, GREEK_SNAPSHOT_DIR,
+# GREEK_STATE_DB, GREEK_SNAPSHOT_TTL_DAYS
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+
+import state_backend
+
+VERSION = 1
+TTL_SECONDS = float(os.environ.get("GREEK_SNAPSHOT_TTL_DAYS", "7")) * 86400
+
+# Schlüssel aus init_state(), die gesichert werden (falls im jeweiligen Skript vorhanden).
+# sid gehört dazu, damit ein fortgesetzter Schüler im Klassenzimmer derselbe bleibt.
+KEYS = ("started", "mode", "rounds", "round_i", "score", "answer", "feedback", "await_next",
+        "auto_final_sigma", "breath", "accent", "iota", "diaer", "room", "student_name", "sid")
+
+_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def new_token() -> str:
+    return secrets.token_urlsafe(12)
+
+
+def valid_token(token) -> bool:
+    return bool(token) and bool(_TOKEN_RE.match(token))
+
+
+def entry_hash(e) -> str:
+    raw = f"{e['roman']}\x1f{e['arabic']}\x1f{e['latin']}\x1f{e['greek']}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _key(token):
+    return f"snap/{token}"
+
+
+def _blob_key(h):
+    return f"blob/{h}"
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = state_backend.from_env()
+    return _backend
+
+
+def set_backend(backend):
+    global _backend
+    flush()
+    _backend = backend
+
+
+# -------------------- Hintergrund-Schreiber --------------------
+_pending = {}        # schlüssel -> bytes (None = löschen); nur der jeweils letzte Stand zählt
+_cond = threading.Condition()
+_writer = None
+_busy = False        # Schreiber arbeitet gerade einen Stapel ab
+_last = {}           # token -> hash des zuletzt eingereihten Snapshots
+
+
+def _run_writer():
+    global _busy
+    try:
+        get_backend().prune(time.time() - TTL_SECONDS)
+    except state_backend.ERRORS:
+        pass
+    while True:
+        with _cond:
+            while not _pending:
+                _cond.wait()
+            # Blobs vor den Snapshots schreiben, die auf sie verweisen
+            items = sorted(_pending.items(), key=lambda kv: not kv[0].startswith("blob/"))
+            _pending.clear()
+            _busy = True
+        backend = get_backend()
+        for key, data in items:
+            try:
+                if data is None:
+                    backend.delete(key)
+                elif data == b"":
+                    backend.touch(key)   # Blob existiert schon: nur als benutzt markieren
+                else:
+                    backend.put(key, data)
+            except state_backend.ERRORS:
+                pass
+        with _cond:
+            _busy = False
+            _cond.notify_all()
+
+
+def _enqueue(path, data):
+    global _writer
+    with _cond:
+        _pending[path] = data
+        if _writer is None:
+            _writer = threading.Thread(target=_run_writer, name="snapshot-writer", daemon=True)
+            _writer.start()
+        _cond.notify_all()
+
+
+def flush(timeout=5.0):
+    # Wartet, bis alles Eingereihte im Speicher angekommen ist. Nötig, bevor eine
+    # Sitzung an einen anderen Prozess übergeben wird (Tests/Benchmarks).
+    end = time.monotonic() + timeout
+    with _cond:
+        while _pending or _busy:
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            _cond.wait(left)
+    return True
+
+
+# -------------------- Sichern --------------------
+def _extras(pool, base):
+    if pool is None:
+        return []
+    extra = getattr(pool, "extra", None)
+    return extra if extra is not None else pool[len(base):]
+
+
+def _extras_key(pool, base):
+    # Billiger Inhaltsschlüssel: Zusatz-Einträge werden nur angehängt (merge_entries,
+    # DeckPool.merge), also bestimmen Anzahl, erster und letzter Eintrag den Inhalt -
+    # auch wenn der Pool dabei durch ein neues Objekt ersetzt wurde.
+    extra = getattr(pool, "extra", None)
+    seq, start = (pool, len(base)) if extra is None else (extra, 0)
+    n = len(seq) - start
+    return (n, seq[start], seq[-1]) if n > 0 else (0, None, None)
+
+
+def _extra_ref(state, pool, base):
+    # Blob-Hash der Zusatz-Einträge; nur neu berechnet, wenn sich der Inhalt ändert.
+    key = _extras_key(pool, base)
+    cached = state.get("snap_pool_ref")
+    if cached is not None and cached[0] == key[0] and cached[1] is key[1] and cached[2] is key[2]:
+        return cached[3]
+    extras = _extras(pool, base)
+    h = None
+    if extras:
+        data = _dumps(list(extras))
+        h = hashlib.blake2b(data, digest_size=12).hexdigest()
+        try:
+            known = get_backend().exists(_blob_key(h))
+        except state_backend.ERRORS:
+            known = False
+        _enqueue(_blob_key(h), b"" if known else data)
+    state["snap_pool_ref"] = key + (h,)
+    return h
+
+
+def save(token, state, base_id, base, pool=None):
+    # base: Sequenz, mit der der Pool beginnt (ENTRIES, BASE_ENTRIES oder Deck)
+    # pool: der Sitzungs-Pool; None, wenn das Skript direkt aus base zieht
+    if not valid_token(token):
+        return
+    snap = {"v": VERSION, "base": base_id,
+            "s": {k: state[k] for k in KEYS if k in state}}
+    if pool is not None:
+        snap["extra"] = _extra_ref(state, pool, base)
+    current = state.get("current")
+    if current is not None and state.get("current_i") is not None:
+        snap["cur"] = [state["current_i"], entry_hash(current)]
+    if state.get("options"):
+        snap["opt"] = list(state["options"])
+    data = _dumps(snap)
+    h = hashlib.blake2b(data, digest_size=8).digest()
+    if _last.get(token) == h:
+        return
+    _last[token] = h
+    _enqueue(_key(token), data)
+
+
+def discard(token):
+    if valid_token(token):
+        _last.pop(token, None)
+        _enqueue(_key(token), None)
+
+
+# -------------------- Wiederherstellen --------------------
+def _read(key):
+    # Noch nicht geschriebene Daten aus der Warteschlange haben Vorrang.
+    with _cond:
+        if key in _pending and _pending[key] != b"":
+            data = _pending[key]
+            if data is None:
+                raise FileNotFoundError(key)
+            return data
+    data = get_backend().get(key)
+    if data is None:
+        raise FileNotFoundError(key)
+    return data
+
+
+def load(token):
+    if not valid_token(token):
+        return None
+    try:
+        snap = json.loads(_read(_key(token)))
+    except (ValueError,) + state_backend.ERRORS:
+        return None
+    if not isinstance(snap, dict) or snap.get("v") != VERSION:
+        return None
+    return snap
+
+
+def restore(token, state, base_id, base, make_pool=None):
+    # Überträgt einen Snapshot in state. make_pool(extras) baut den Sitzungs-Pool
+    # (nur für Skripte mit eigenem Pool). Gibt True zurück, wenn etwas geladen wurde.
+    snap = load(token)
+    if snap is None:
+        return False
+    for k, v in snap.get("s", {}).items():
+        if k == "sid" and not valid_token(v):
+            continue   # sid landet auch in Dateinamen (governor.py)
+        if k in KEYS:
+            state[k] = v
+    seq = base
+    if make_pool is not None:
+        extras = []
+        if snap.get("extra"):
+            try:
+                extras = json.loads(_read(_blob_key(snap["extra"])))
+            except (ValueError,) + state_backend.ERRORS:
+                extras = []
+        seq = state["pool"] = make_pool(extras)
+    state["current"] = None
+    state["options"] = []
+    cur = snap.get("cur")
+    if cur is not None and snap.get("base") == base_id:
+        idx, h = cur
+        if 0 <= idx < len(seq) and entry_hash(seq[idx]) == h:
+            state["current"] = seq[idx]
+            state["current_i"] = idx
+            state["options"] = snap.get("opt", [])
+    if state.get("started") and state["current"] is None:
+        # Frage nicht mehr auffindbar: Runde wird mit neuer Frage fortgesetzt
+        state["round_i"] = max(0, state.get("round_i", 1) - 1)
+        state["await_next"] = False
+    _last[token] = None
+    return True
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Austauschbarer Speicher für den Quiz-Zustand (Snapshots + Pool-Blobs)
+#
+# Einfacher Schlüssel/Wert-Speicher mit Bytes als Werten. snapshot.py legt dort
+# den Zustand aus init_state() ab ("snap/<token>") und die hochgeladenen
+# Zusatz-Einträge ("blob/<hash>").
+#
+#   file    : ein JSON pro Schlüssel unter GREEK_SNAPSHOT_DIR (Standard, ein Prozess)
+#   sqlite  : eine SQLite-Datei (GREEK_STATE_DB), von mehreren App-Prozessen geteilt
+#   memory  : nur im Prozess (für Tests)
+# Auswahl per GREEK_STATE_BACKEND=file|sqlite|memory.
+#
+# Mehrere Prozesse hinter einem lokalen Load Balancer, z. B.:
+#   GREEK_STATE_BACKEND=sqlite streamlit run greek_numbers_streamlit.py --server.port 8501
+#   GREEK_STATE_BACKEND=sqlite streamlit run greek_numbers_streamlit.py --server.port 8502
+# Der Balancer muss WebSockets sticky halten; beim Wiederverbinden auf einem anderen
+# Prozess wird die Sitzung über ?resume=<token> aus der gemeinsamen Datenbank geladen.
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Fehler, die ein Speicher beim Lesen/Schreiben werfen kann
+ERRORS = (OSError, sqlite3.Error)
+
+STATE_DIR = os.environ.get("GREEK_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "greek_numbers_snapshots"))
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._data = {}   # key -> (bytes, mtime)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+        return None if item is None else item[0]
+
+    def put(self, key, data):
+        with self._lock:
+            self._data[key] = (data, time.time())
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def exists(self, key):
+        with self._lock:
+            return key in self._data
+
+    def touch(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                self._data[key] = (item[0], time.time())
+
+    def prune(self, cutoff):
+        with self._lock:
+            for key in [k for k, (_, t) in self._data.items() if t < cutoff]:
+                del self._data[key]
+
+
+class FileBackend:
+    def __init__(self, root=STATE_DIR):
+        self.root = root
+
+    def _path(self, key):
+        kind, _, name = key.partition("/")
+        if kind == "snap":
+            return os.path.join(self.root, f"{name}.json")
+        return os.path.join(self.root, kind + "s", f"{name}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def touch(self, key):
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def prune(self, cutoff):
+        for d in (self.root, os.path.join(self.root, "blobs")):
+            try:
+                names = os.listdir(d)
+            except OSError:
+                continue
+            for name in names:
+                p = os.path.join(d, name)
+                try:
+                    if os.path.isfile(p) and os.path.getmtime(p) < cutoff:
+                        os.remove(p)
+                except OSError:
+                    pass
+
+
+class SQLiteBackend:
+    # Eine Verbindung pro Thread; WAL erlaubt parallele Leser neben einem Schreiber.
+    def __init__(self, path=None):
+        self.path = path or os.path.join(STATE_DIR, "state.sqlite3")
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def put(self, key, data):
+        self._conn().execute(
+            "INSERT INTO kv (key, value, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+            (key, data, time.time()),
+        )
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def exists(self, key):
+        return self._conn().execute("SELECT 1 FROM kv WHERE key = ?", (key,)).fetchone() is not None
+
+    def touch(self, key):
+        self._conn().execute("UPDATE kv SET updated = ? WHERE key = ?", (time.time(), key))
+
+    def prune(self, cutoff):
+        self._conn().execute("DELETE FROM kv WHERE updated < ?", (cutoff,))
+
+
+def from_env():
+    kind = os.environ.get("GREEK_STATE_BACKEND", "file").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(os.environ.get("GREEK_STATE_DB"))
+    if kind == "memory":
+        return MemoryBackend()
+    if kind != "file":
+        raise ValueError(f"Unbekanntes GREEK_STATE_BACKEND: {kind}")
+    return FileBackend()
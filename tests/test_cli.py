@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Terminal-Quiz: Beta-Code-Eingabe und ein reproduzierbarer Durchlauf
+
+import io
+import os
+import random
+import sys
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import greek_numbers_cli as cli
+from greek_numbers_core import ENTRIES
+
+
+def nfc(s):
+    return unicodedata.normalize("NFC", s)
+
+
+@pytest.mark.parametrize("beta, greek", [
+    ("e(/c", "ἕξ"),
+    ("pe/nte", "πέντε"),
+    ("*e(kato/n", "Ἑκατόν"),
+    ("a)/|", "ᾄ"),
+    ("i+/", "ΐ"),
+    ("h(=|", "ᾗ"),
+    ("r(", "ῥ"),
+    ("*a)/", "Ἄ"),
+    ("tri/s", "τρίς"),          # Schluss-Sigma
+    ("δέκα", "δέκα"),           # griechische Eingabe bleibt unverändert
+])
+def test_beta_to_greek(beta, greek):
+    assert cli.beta_to_greek(beta) == nfc(greek)
+
+
+def _run(monkeypatch, answers, pool, mode="WRITE", seed=7):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("".join(a + "\n" for a in answers)))
+    out = io.StringIO()
+    score = cli.run_quiz(pool, mode, len(answers), random.Random(seed), out)
+    return score, out.getvalue()
+
+
+def test_run_quiz_write_mode_seeded(monkeypatch):
+    pool = list(ENTRIES)
+    rng = random.Random(7)
+    picks = [pool[rng.randrange(len(pool))] for _ in range(3)]
+    answers = [picks[0]["greek"].split("/")[0], "xxx", picks[2]["greek"].split("/")[-1]]
+    score, text = _run(monkeypatch, answers, pool)
+    assert score == 2
+    assert text.count("✅ Richtig!") == 2
+    assert f"❌ Falsch. Richtig: {picks[1]['greek']}" in text
+    assert "Fertig! Ergebnis: 2/3" in text
+    for e in picks:
+        assert f"Frage: {e['roman']} (= {e['arabic']})" in text
+
+
+def test_run_quiz_mc_and_abort(monkeypatch):
+    pool = list(ENTRIES)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("A\n"))
+    out = io.StringIO()
+    score = cli.run_quiz(pool, "MC", 5, random.Random(1), out)
+    text = out.getvalue()
+    assert "  D: " in text
+    assert "Abgebrochen." in text
+    assert f"Fertig! Ergebnis: {score}/1" in text
+
+
+def test_load_pool_with_csv(tmp_path):
+    p = tmp_path / "extra.csv"
+    p.write_text("roman,arabic,latin,greek\nMM,2000,duo milia,δισχίλιοι\nI,1,unus,εἷς\n", encoding="utf-8")
+    pool = cli.load_pool([str(p)])
+    assert len(pool) == len(ENTRIES) + 1
+    assert pool[-1]["roman"] == "MM"
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Binäres Deck (.gndk): Schreiben/Lesen, Suche, Schlüssel, Fehlerfälle, DeckPool.merge
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import deck_bin
+from greek_numbers_core import BASE_ENTRIES, ENTRIES, greek_key, is_correct, matches_key
+
+ROWS = [
+    {"roman": "IV", "arabic": 4, "latin": "quattuor", "greek": "τέσσαρες/τέσσαρα"},
+    {"roman": "I", "arabic": 1, "latin": "unus", "greek": "εἷς/μία/ἕν"},
+    {"roman": "X", "arabic": 10, "latin": "decem", "greek": "δέκα"},
+    {"roman": "I", "arabic": 1, "latin": "doppelt", "greek": "x"},   # Duplikat, wird übersprungen
+]
+
+
+@pytest.fixture
+def deck(tmp_path):
+    path = str(tmp_path / "test.gndk")
+    assert deck_bin.write_deck(ROWS, path) == 3
+    d = deck_bin.BinaryDeck(path)
+    yield d
+    d.close()
+
+
+def test_round_trip_sorted_and_deduplicated(deck):
+    assert len(deck) == 3
+    assert [e["arabic"] for e in deck] == [1, 4, 10]
+    assert deck[0] == ROWS[1]
+    assert deck[-1] == ROWS[2]
+    assert list(deck)[1] == ROWS[0]
+    with pytest.raises(IndexError):
+        deck[3]
+
+
+def test_round_trip_full_data(tmp_path):
+    path = str(tmp_path / "voll.gndk")
+    n = deck_bin.write_deck(ENTRIES, path)
+    d = deck_bin.BinaryDeck(path)
+    assert len(d) == n == len({(e["arabic"], e["roman"]) for e in ENTRIES})
+    for e in ENTRIES:
+        assert d[d.find(e["roman"], e["arabic"])] == e
+    d.close()
+
+
+def test_find(deck):
+    assert deck.find("IV", 4) == 1
+    assert deck.find("X", 10) == 2
+    assert deck.find("IV", 5) == -1
+    assert deck.find("V", 4) == -1
+    assert deck.find("A", 0) == -1
+    assert deck.find("Z", 99) == -1
+
+
+def test_greek_key_matches_grading(deck):
+    for i, e in enumerate(deck):
+        key = deck.greek_key(i)
+        assert key == greek_key(e["greek"])
+        for part in e["greek"].split("/"):
+            assert matches_key(part, key) == is_correct(part, e["greek"]) is True
+    assert deck.greek_key(1) == "τεσσαρεσ/τεσσαρα"
+    assert not matches_key("πεντε", deck.greek_key(1))
+
+
+def test_empty_deck_rejected(tmp_path):
+    path = str(tmp_path / "leer.gndk")
+    with pytest.raises(ValueError):
+        deck_bin.write_deck([], path)
+    assert not os.path.exists(path)
+    with open(path, "wb") as f:
+        f.write(deck_bin.HEADER.pack(deck_bin.MAGIC, deck_bin.VERSION, 0, 0, deck_bin.HEADER.size, 0))
+    with pytest.raises(ValueError, match="keine Einträge"):
+        deck_bin.BinaryDeck(path)
+
+
+@pytest.mark.parametrize("corrupt", ["magic", "version", "short", "strings", "records"])
+def test_corrupt_header_rejected(tmp_path, corrupt):
+    path = str(tmp_path / "kaputt.gndk")
+    deck_bin.write_deck(ROWS, path)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    magic, version, _, n, off, size = deck_bin.HEADER.unpack_from(data, 0)
+    if corrupt == "magic":
+        data[:4] = b"XXXX"
+    elif corrupt == "version":
+        deck_bin.HEADER.pack_into(data, 0, magic, version + 1, 0, n, off, size)
+    elif corrupt == "short":
+        data = data[:deck_bin.HEADER.size - 1]
+    elif corrupt == "strings":
+        deck_bin.HEADER.pack_into(data, 0, magic, version, 0, n, off, size + 1)
+    else:
+        deck_bin.HEADER.pack_into(data, 0, magic, version, 0, n + 1000, off, size)
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError):
+        deck_bin.BinaryDeck(path)
+
+
+def test_pool_merge_dedup_and_max_rows(deck):
+    pool = deck_bin.DeckPool(deck)
+    upload = [
+        {"roman": "IV", "arabic": 4, "latin": "", "greek": "im Deck"},
+        {"roman": "V", "arabic": 5, "latin": "quinque", "greek": "πέντε"},
+        {"roman": "V", "arabic": 5, "latin": "", "greek": "doppelt"},
+        {"roman": "VI", "arabic": 6, "latin": "sex", "greek": "ἕξ"},
+        {"roman": "VII", "arabic": 7, "latin": "septem", "greek": "ἑπτά"},
+    ]
+    merged, added = pool.merge(upload, max_rows=2)
+    assert added == 2
+    assert merged.extra == [upload[1], upload[3]]
+    assert pool.extra == []
+    assert len(merged) == len(deck) + 2
+    assert merged[len(deck)] == upload[1]
+    assert merged[-1] == upload[3]
+    assert merged.greek_key(len(deck) + 1) == greek_key("ἕξ")
+    assert merged.greek_key(0) == deck.greek_key(0)
+
+    again, added = merged.merge(upload, max_rows=2)
+    assert added == 0 and again is merged
+
+    more, added = merged.merge(upload)
+    assert added == 1 and more.extra[-1] == upload[4]
+
+
+def test_convert_and_open_deck(tmp_path):
+    csv_path = tmp_path / "basis.csv"
+    csv_path.write_text("roman,arabic,latin,greek\nI,1,unus,εις/μια/εν\nX,10,decem,δεκα\n", encoding="utf-8")
+    out = str(tmp_path / "basis.gndk")
+    assert deck_bin.convert([str(csv_path)], out) == 2
+    d = deck_bin.open_deck(out)
+    assert deck_bin.open_deck(out) is d
+    assert d.find("X", 10) == 1
+    assert len(deck_bin.DeckPool(d, BASE_ENTRIES[:1])) == 3
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Der Governor muss den Pool auslagern, den die Session tatsächlich benutzt,
+# auch wenn der Datei-Upload bei jedem Durchlauf dieselben Dateien liefert.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import governor
+from greek_numbers_core import BASE_ENTRIES, merge_entries
+
+UPLOAD = [{"roman": f"R{i}", "arabic": 100000 + i, "latin": f"l{i}", "greek": f"g{i}"} for i in range(500)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_governor(tmp_path, monkeypatch):
+    monkeypatch.setattr(governor, "SPILL_DIR", str(tmp_path))
+    monkeypatch.setattr(governor, "IDLE_SECONDS", 10.0)
+    monkeypatch.setattr(governor, "SPILL_MIN_BYTES", 0)
+    monkeypatch.setattr(governor, "_sessions", {})
+    monkeypatch.setattr(governor, "_last_sweep", 0.0)
+
+
+def _rerun(state, sid):
+    # Ausschnitt aus greek_numbers_streamlit_simple.py: touch(), dann Upload mergen
+    governor.touch(sid, state["pool"])
+    state["pool"], _ = merge_entries(state["pool"], UPLOAD, governor.MAX_POOL_ROWS)
+    governor.account(sid, state["pool"])
+
+
+def _sweep_later():
+    governor._last_sweep = 0.0
+    governor._maybe_sweep(governor._sessions["a"]["last_seen"] + governor.IDLE_SECONDS + 1)
+
+
+def test_repeated_upload_keeps_pool_object():
+    pool, added = merge_entries(list(BASE_ENTRIES), UPLOAD)
+    again, added_again = merge_entries(pool, UPLOAD)
+    assert added == len(UPLOAD) and added_again == 0
+    assert again is pool
+
+
+def test_spill_empties_session_pool():
+    state = {"pool": list(BASE_ENTRIES)}
+    for _ in range(3):
+        _rerun(state, "a")
+    rows = len(state["pool"])
+    assert rows == len(BASE_ENTRIES) + len(UPLOAD)
+
+    _sweep_later()
+    assert state["pool"] == []
+    assert governor.session_info("a")["spilled"]
+    assert governor.totals()["bytes"] == 0
+
+    assert governor.touch("a", state["pool"])
+    assert len(state["pool"]) == rows
+
+
+def test_spill_skips_session_that_became_active():
+    state = {"pool": list(BASE_ENTRIES)}
+    _rerun(state, "a")
+    seen = governor._sessions["a"]["last_seen"]
+    governor.touch("a", state["pool"])   # Session wird aktiv, während die Datei geschrieben wird
+    governor._sessions["a"]["last_seen"] = seen + 1
+    governor._spill("a", state["pool"], seen)
+    assert len(state["pool"]) == len(BASE_ENTRIES) + len(UPLOAD)
+    assert not governor.session_info("a")["spilled"]
+    assert not os.path.exists(governor._spill_path("a"))
+
+
+def test_spill_empties_deck_overlay(tmp_path):
+    import deck_bin
+    path = str(tmp_path / "basis.gndk")
+    deck_bin.write_deck(BASE_ENTRIES, path)
+    deck = deck_bin.BinaryDeck(path)
+    state = {"pool": deck_bin.DeckPool(deck)}
+    governor.touch("a", state["pool"])
+    state["pool"], added = state["pool"].merge(UPLOAD, governor.MAX_POOL_ROWS)
+    governor.account("a", state["pool"])
+    assert added == len(UPLOAD)
+
+    _sweep_later()
+    assert state["pool"].extra == []
+    assert len(state["pool"]) == len(deck)
+    assert governor.session_info("a")["spilled"]
+
+    assert governor.touch("a", state["pool"])
+    assert len(state["pool"].extra) == len(UPLOAD)
+    assert state["pool"][len(deck)] == UPLOAD[0]
+    deck.close()
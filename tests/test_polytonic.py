@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Polytonische Tabellen (aus unicodedata abgeleitet) und Rückmeldung pro Diakritikum
+
+import itertools
+import os
+import sys
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import polytonic
+
+
+@pytest.mark.parametrize("key, ch", [
+    (("α", "smooth", None, True), "ᾀ"),      # früher ᾳ ohne Atemzeichen
+    (("η", "rough", None, True), "ᾑ"),       # früher die Lenis-Form
+    (("ω", "rough", None, True), "ᾡ"),
+    (("η", "rough", "acute", True), "ᾕ"),
+    (("ω", "rough", "circ", True), "ᾧ"),
+    (("ρ", "rough"), "ῥ"),
+    (("ρ", "smooth"), "ῤ"),
+    (("Α", "smooth", "acute"), "Ἄ"),
+    (("Ε", "rough"), "Ἑ"),
+    (("Ω", "rough", None, True), "ᾩ"),
+    (("ι", None, "acute", False, True), "ΐ"),
+    (("ε", None, "acute"), "έ"),
+    (("α",), "α"),
+])
+def test_compose(key, ch):
+    assert polytonic.compose(*key) == unicodedata.normalize("NFC", ch)
+
+
+def test_compose_without_precomposed_form():
+    # Trema + Atemzeichen gibt es nicht vorkomponiert: NFC-Folge statt nacktem Vokal
+    ch = polytonic.compose("υ", "smooth", None, False, True)
+    assert len(ch) > 1
+    assert unicodedata.normalize("NFD", ch)[0] == "υ"
+    assert polytonic.letters(ch) == [("υ", "smooth", None, False, True)]
+
+
+def test_round_trip():
+    combos = itertools.product(polytonic.BASES, (None, "smooth", "rough"), (None, "acute", "grave", "circ"),
+                               (False, True), (False, True))
+    checked = 0
+    for key in combos:
+        ch = polytonic.compose(*key)
+        if len(ch) == 1 and ch != key[0]:
+            assert polytonic.decompose(ch) == key
+            assert polytonic.compose_table()[key] == ch
+            checked += 1
+    assert checked == len(polytonic.compose_table())
+    assert polytonic.decompose("β") == ("β", None, None, False, False)
+
+
+def test_tables_read_only():
+    with pytest.raises(TypeError):
+        polytonic.compose_table()[("α", None, None, False, False)] = "x"
+
+
+@pytest.mark.parametrize("answer, solution, hints", [
+    ("πέντε", "πέντε", []),
+    ("πεντε", "πέντε", ["ε (2. Zeichen): Akut fehlt"]),
+    ("εξ", "ἕξ", ["ε (1. Zeichen): Spiritus asper fehlt", "ε (1. Zeichen): Akut fehlt"]),
+    ("ἐννὲα", "ἐννέα", ["ε (4. Zeichen): Akut statt Gravis"]),
+    ("ᾳ", "α", ["α (1. Zeichen): Iota subscriptum zu viel"]),
+    ("τρεις", "τρεῖς", ["ι (4. Zeichen): Zirkumflex fehlt"]),
+    ("δυο", "πέντε", []),                    # andere Buchstaben: keine Hinweise
+])
+def test_diacritic_feedback(answer, solution, hints):
+    assert polytonic.diacritic_feedback(answer, solution) == hints